@@ -1,9 +1,11 @@
 # src/reporting.py
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
+# pandas/matplotlib are imported inside the functions that use them, so
+# importing this module (e.g. from main.py) stays cheap.
 
 def performance_reporting(equity_ts):
+    import numpy as np
+    import pandas as pd
+
     # Convert to DataFrame for easy calculations
     df = pd.DataFrame(equity_ts, columns=['timestamp', 'equity']).set_index('timestamp')
 
@@ -33,6 +35,7 @@ def performance_reporting(equity_ts):
     }
 
 def plot_r_ts(cum_ret):
+    import matplotlib.pyplot as plt
     plt.plot(cum_ret.index, cum_ret)
     plt.title("Cumulative Returns")
     plt.ylabel("Cumulative Return")
@@ -40,6 +43,7 @@ def plot_r_ts(cum_ret):
     plt.show()
 
 def plot_r_dist(r):
+    import matplotlib.pyplot as plt
     plt.hist(r, bins=30, density=True)
     plt.title("Distribution of Returns")
     plt.ylabel("Frequency")
@@ -47,6 +51,7 @@ def plot_r_dist(r):
     plt.show()
 
 def plot_dd(dd):
+    import matplotlib.pyplot as plt
     plt.plot(dd.index, dd)
     plt.title("Drawdown Series")
     plt.ylabel("Drawdown")
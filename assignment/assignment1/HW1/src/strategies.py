@@ -1,8 +1,16 @@
 # src/strategies.py
 # Create an abstract base class:
 from abc import ABC, abstractmethod
+from collections import deque
+from math import fsum
 from models import MarketDataPoint
 
+# how often the running sums are recomputed from the window
+RESYNC_EVERY = 4096
+
+def resync_interval(window):
+    return max(RESYNC_EVERY, 16 * window)
+
 class Strategy(ABC):
     @abstractmethod
     def generate_signals(self, tick: MarketDataPoint) -> list:
@@ -21,17 +29,25 @@ class MeanReversionStrategy(Strategy):
     def __init__(self, window, quantity):
         self._window = window
         self._quantity = quantity
-        self._prices = []  # for tracking past prices
+        self._prices = deque(maxlen=window)  # for tracking past prices (only the rolling window)
+        self._sum = 0.0  # running sum of self._prices
+        self._updates = 0
+        self._resync_every = resync_interval(window)
 
     def generate_signals(self, tick: MarketDataPoint) -> list:
         signals = []
-        self._prices.append(tick.price)
 
         # We want to calculate the moving average (don't look at prices outside of the rolling window)
-        if len(self._prices) > self._window:
-            self._prices.pop(0)
+        if len(self._prices) == self._window:
+            self._sum -= self._prices[0]  # O(1) drop of the oldest price
+        self._prices.append(tick.price)
+        self._sum += tick.price
+
+        self._updates += 1
+        if self._updates % self._resync_every == 0:
+            self._sum = fsum(self._prices)
 
-        moving_avg = sum(self._prices) / len(self._prices)
+        moving_avg = self._sum / len(self._prices)
 
         if tick.price > moving_avg:  # above average -> short
             signals.append(('SELL', tick.symbol, self._quantity, tick.price))
@@ -51,14 +67,16 @@ class MomentumStrategy(Strategy):
     def __init__(self, window, quantity):
         self._window = window
         self._quantity = quantity
-        self._prices = []  # past prices
+        self._prices = deque(maxlen=window)  # past prices (bounded to the lookback window)
+        self._count = 0
 
     def generate_signals(self, tick: MarketDataPoint) -> list:
         signals = []
         self._prices.append(tick.price)
+        self._count += 1
 
-        if len(self._prices) > self._window:  # Once we have enough price data (i.e., can compare today's price to the one "window" ticks ago),
-            past_price = self._prices[-self._window]  # the past price we'll use is the one from "window" periods ago
+        if self._count > self._window:  # Once we have enough price data (i.e., can compare today's price to the one "window" ticks ago),
+            past_price = self._prices[0]  # the past price we'll use is the one from "window" periods ago
 
             if tick.price > past_price:  # upward momentum -> long
                 signals.append(('BUY', tick.symbol, self._quantity, tick.price))
@@ -1,8 +1,16 @@
 from typing import List
 from collections import deque
+from math import fsum
 from models import MarketDataPoint
 from abc import ABC, abstractmethod
 
+# ticks between exact fsum recomputes of the running sum
+RESYNC_EVERY = 4096
+
+
+def resync_interval(window_size: int) -> int:
+    return max(RESYNC_EVERY, 16 * window_size)
+
 
 class Strategy(ABC):
     @abstractmethod
@@ -34,6 +42,8 @@ class WindowedMovingAverageStrategy(Strategy):
         self.window_size = window_size
         self.prices = deque(maxlen=window_size)
         self.running_sum = 0.0
+        self.updates = 0
+        self.resync_every = resync_interval(window_size)  # amortized O(1)
 
     def generate_signals(self, tick: MarketDataPoint) -> List[str]:
         currentPrice = tick.price
@@ -41,6 +51,9 @@ class WindowedMovingAverageStrategy(Strategy):
             self.running_sum -= self.prices[0]  # O(1)
         self.prices.append(currentPrice)          # O(1)
         self.running_sum += currentPrice          # O(1)
+        self.updates += 1
+        if self.updates % self.resync_every == 0:
+            self.running_sum = fsum(self.prices)  # exact resync bounds float drift
         avg_price = self.running_sum / len(self.prices)  # O(1)
         if currentPrice < avg_price:
             return [f"BUY {tick.symbol} at {currentPrice:.2f}"]
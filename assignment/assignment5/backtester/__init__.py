@@ -1,11 +1,20 @@
 from .strategy import VolatilityBreakoutStrategy
-from .broker import Broker
+from .broker import Broker, MultiAssetBroker
 from .engine import Backtester
 from .price_loader import PriceLoader
+from .monte_carlo import MonteCarloResult, run_monte_carlo
+from .sweep import sweep_lookbacks
+from .order_book import OrderBook, BookBroker
 
 __all__ = [
 'VolatilityBreakoutStrategy',
 'Broker',
+'MultiAssetBroker',
 'Backtester',
 'PriceLoader',
-]
\ No newline at end of file
+'MonteCarloResult',
+'run_monte_carlo',
+'sweep_lookbacks',
+'OrderBook',
+'BookBroker',
+]
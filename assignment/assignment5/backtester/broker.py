@@ -1,3 +1,5 @@
+import numpy as np
+
 class Broker:
     def __init__(self, cash: float = 1_000_000):
         self.cash = cash
@@ -22,3 +24,83 @@ class Broker:
                 raise RuntimeError("insufficient shares")
             self.cash += cost
             self.position -= qty
+
+
+# submit_batch result codes (checked in this order, first failing rule wins)
+FILLED = 0
+BAD_SIDE = 1
+BAD_QTY = 2
+BAD_PRICE = 3
+UNKNOWN_SYMBOL = 4
+INSUFFICIENT_SHARES = 5
+INSUFFICIENT_CASH = 6
+
+
+class MultiAssetBroker:
+    """
+    Cash plus a position vector indexed by symbol id. submit_batch applies a whole
+    vector of market orders at once and returns one result code per order instead
+    of raising.
+
+    Order of application: all valid SELLs first (they release cash), then all
+    valid BUYs, each group in submission order. Within a group the same rules as
+    Broker.market_order apply cumulatively, and the first order that does not fit
+    (per symbol for sells, overall for buys) is rejected together with every
+    later order of that group, like Backtester.run stopping at the first failure.
+    """
+    def __init__(self, symbols, cash: float = 1_000_000):
+        self.symbols = list(symbols)
+        self.symbol_id = {s: i for i, s in enumerate(self.symbols)}
+        self.cash = cash
+        self.position = np.zeros(len(self.symbols), dtype=np.int64)
+
+    @staticmethod
+    def _side_codes(sides):
+        sides = np.asarray(sides)
+        if sides.dtype.kind in "iuf":
+            return np.where(sides > 0, 1, np.where(sides < 0, -1, 0))
+        return np.where(sides == "BUY", 1, np.where(sides == "SELL", -1, 0))
+
+    def submit_batch(self, sides, qtys, prices, symbol_ids):
+        side = self._side_codes(sides)
+        qty = np.asarray(qtys, dtype=np.int64)
+        price = np.asarray(prices, dtype=float)
+        ids = np.asarray(symbol_ids, dtype=np.int64)
+        if not (len(side) == len(qty) == len(price) == len(ids)):
+            raise ValueError("order arrays must have the same length")
+
+        codes = np.select(
+            [side == 0, qty <= 0, ~(price > 0), (ids < 0) | (ids >= len(self.position))],
+            [BAD_SIDE, BAD_QTY, BAD_PRICE, UNKNOWN_SYMBOL],
+            FILLED,
+        ).astype(np.int8)
+        valid = codes == FILLED
+
+        # SELLs: grouped by symbol (stable, so submission order is kept inside a group)
+        sells = np.flatnonzero(valid & (side < 0))
+        if len(sells):
+            sells = sells[np.argsort(ids[sells], kind="stable")]
+            g, q = ids[sells], qty[sells]
+            cum = np.cumsum(q)
+            first = np.r_[True, g[1:] != g[:-1]]
+            group_base = (cum - q)[first][np.cumsum(first) - 1]
+            ok = cum - group_base <= self.position[g]
+            codes[sells[~ok]] = INSUFFICIENT_SHARES
+            filled = sells[ok]
+            np.subtract.at(self.position, ids[filled], qty[filled])
+            self.cash += float(np.sum(qty[filled] * price[filled]))
+
+        # BUYs: one shared cash budget, in submission order
+        buys = np.flatnonzero(valid & (side > 0))
+        if len(buys):
+            cum = np.cumsum(qty[buys] * price[buys])
+            ok = cum <= self.cash
+            codes[buys[~ok]] = INSUFFICIENT_CASH
+            filled = buys[ok]
+            np.add.at(self.position, ids[filled], qty[filled])
+            if len(filled):
+                self.cash -= float(cum[ok][-1])
+        return codes
+
+    def equity(self, prices) -> float:
+        return float(self.cash + np.dot(self.position, np.asarray(prices, dtype=float)))
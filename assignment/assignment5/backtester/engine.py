@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 from unittest.mock import MagicMock
@@ -8,6 +9,8 @@ class Backtester:
         self.strategy = strategy
         self.broker = broker
         self.qty = qty
+        self._pending = 0  # signal from the previous step(), traded at the next price
+        self._steps = 0
 
     def run(self, prices: pd.Series):
         if len(prices) < 2:
@@ -26,4 +29,75 @@ class Backtester:
                 self.broker.market_order("SELL", self.qty, p)
 
         equity = self.broker.cash + self.broker.position * float(prices.iloc[-1])
-        return equity
\ No newline at end of file
+        return equity
+
+    def step(self, price: float) -> float:
+        """
+        Live mode: consume one new price, trade on the previous price's signal
+        (same t-1 offset as run) and return the current equity. Needs a strategy
+        with an incremental update(price); O(1) per price for the default one.
+        """
+        p = float(price)
+        if self._steps:
+            if self._pending > 0:
+                self.broker.market_order("BUY", self.qty, p)
+            elif self._pending < 0:
+                self.broker.market_order("SELL", self.qty, p)
+        self._pending = self.strategy.update(p)
+        self._steps += 1
+        return self.broker.cash + self.broker.position * p
+
+    def run_vectorized(self, prices: pd.Series):
+        """
+        Array version of run(): same t-1 signal offset and Broker rules, but the
+        fill, cash and position paths are built with cumulative sums instead of
+        one market_order call per signal. Raises at the same index the loop
+        would, leaving the broker in the state it had just before that order.
+        Returns (final equity, equity curve).
+        """
+        if len(prices) < 2:
+            raise ValueError("need at least 2 price points")
+
+        sigs = self.strategy.signals(prices)
+        if len(sigs) != len(prices):
+            raise ValueError("signals must align with prices")
+
+        s = np.asarray(sigs, dtype=float)
+        px = np.asarray(prices, dtype=float)
+        n = len(px)
+
+        side = np.zeros(n, dtype=np.int64)
+        side[1:] = np.where(s[:-1] > 0, 1, np.where(s[:-1] < 0, -1, 0))
+        traded = side != 0
+
+        qty = self.qty
+        cash0, pos0 = self.broker.cash, self.broker.position
+        delta = side * qty
+        flows = np.where(traded, -(delta * np.where(traded, px, 0.0)), 0.0)
+        cash = np.cumsum(np.concatenate(([cash0], flows)))
+        pos = pos0 + np.cumsum(np.concatenate(([0], delta)))
+        cash_prev, pos_prev = cash[:-1], pos[:-1]
+        cash, pos = cash[1:], pos[1:]
+
+        if traded.any() and qty <= 0:
+            raise ValueError("qty must be positive")
+        bad_price = traded & (px <= 0)
+        no_cash = (side == 1) & (qty * px > cash_prev)
+        no_shares = (side == -1) & (qty > pos_prev)
+        failed = bad_price | no_cash | no_shares
+        if failed.any():
+            t = int(np.argmax(failed))
+            self.broker.cash = float(cash_prev[t])
+            self.broker.position = pos_prev[t].item()
+            if bad_price[t]:
+                raise ValueError(f"price must be positive (t={t})")
+            if no_cash[t]:
+                raise RuntimeError(f"insufficient cash (t={t})")
+            raise RuntimeError(f"insufficient shares (t={t})")
+
+        self.broker.cash = float(cash[-1])
+        self.broker.position = pos[-1].item()
+
+        curve = pd.Series(cash + pos * px, index=prices.index)
+        equity = self.broker.cash + self.broker.position * float(prices.iloc[-1])
+        return equity, curve
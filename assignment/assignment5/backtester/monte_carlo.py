@@ -0,0 +1,130 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from .price_loader import PriceLoader, _chunk_rows, _gbm_chunk
+
+
+@dataclass
+class MonteCarloResult:
+    final_equity: np.ndarray
+    max_drawdown: np.ndarray
+    trades: np.ndarray
+    rejected: np.ndarray
+    chunk_id: np.ndarray
+    sampling: str = "plain"
+
+    def standard_error(self, name: str) -> float:
+        """
+        Standard error of the mean of a per-path statistic, respecting the sampling:
+        antithetic uses pair means, sobol uses the spread of the independently
+        scrambled chunk means (run_monte_carlo guarantees at least two), moment matching uses the
+        plain iid formula as an approximation.
+        """
+        x = np.asarray(getattr(self, name), dtype=float)
+        if self.sampling == "antithetic":
+            x = 0.5 * (x[0::2] + x[1::2])
+        elif self.sampling == "sobol":
+            chunks = np.unique(self.chunk_id)
+            if len(chunks) < 2:
+                return float("nan")
+            x = np.array([x[self.chunk_id == c].mean() for c in chunks])
+        if len(x) < 2:
+            return float("nan")
+        return float(x.std(ddof=1) / np.sqrt(len(x)))
+
+    def summary(self) -> dict:
+        out = {}
+        for name in ("final_equity", "max_drawdown", "trades"):
+            x = getattr(self, name)
+            out[name] = {
+                "mean": float(x.mean()),
+                "se": self.standard_error(name),
+                "std": float(x.std(ddof=1)) if len(x) > 1 else 0.0,
+                "p05": float(np.quantile(x, 0.05)),
+                "p50": float(np.quantile(x, 0.50)),
+                "p95": float(np.quantile(x, 0.95)),
+            }
+        return out
+
+
+def backtest_paths(sigs: np.ndarray, prices: np.ndarray, cash: float = 1_000_000,
+                   qty: int = 1, position: int = 0):
+    """
+    Backtester.run across every row at once: the t-1 signal is filled at price t
+    with the Broker cash/share rules. A path is not aborted on a failing order;
+    the order is rejected and counted instead.
+    Returns (final_equity, max_drawdown, trades, rejected), one value per path.
+    """
+    n_paths, n_steps = prices.shape
+    cash = np.full(n_paths, float(cash))
+    pos = np.full(n_paths, position, dtype=np.int64)
+    trades = np.zeros(n_paths, dtype=np.int64)
+    rejected = np.zeros(n_paths, dtype=np.int64)
+
+    equity = cash + pos * prices[:, 0]
+    peak = equity.copy()
+    mdd = np.zeros(n_paths)
+    for t in range(1, n_steps):
+        s, p = sigs[:, t - 1], prices[:, t]
+        buy, sell = s > 0, s < 0
+        cost = qty * p
+        ok_buy = buy & (cost <= cash)
+        ok_sell = sell & (pos >= qty)
+        cash = cash - np.where(ok_buy, cost, 0.0) + np.where(ok_sell, cost, 0.0)
+        pos += qty * (ok_buy.astype(np.int64) - ok_sell)
+        trades += ok_buy | ok_sell
+        rejected += (buy & ~ok_buy) | (sell & ~ok_sell)
+
+        equity = cash + pos * p
+        np.maximum(peak, equity, out=peak)
+        # a path whose equity has never been positive has no drawdown to measure
+        dd = np.divide(equity - peak, peak, out=np.zeros(n_paths), where=peak > 0)
+        np.minimum(mdd, dd, out=mdd)
+    return equity, mdd, trades, rejected
+
+
+def _run_chunk(args):
+    seed_seq, rows, n_steps, price_kw, strategy, cash, qty = args
+    prices = _gbm_chunk(seed_seq, rows, n_steps, **price_kw)
+    return backtest_paths(strategy.signals_matrix(prices), prices, cash=cash, qty=qty)
+
+
+def run_monte_carlo(strategy, n_paths: int, n_steps: int, seed: int = 42, chunk_size: int = 1024,
+                    workers: int = 1, cash: float = 1_000_000, qty: int = 1,
+                    start_price: float = 100.0, drift: float = 0.0003, vol: float = 0.01,
+                    sampling: str = "plain") -> MonteCarloResult:
+    """
+    Simulate n_paths GBM paths in chunks of chunk_size rows, evaluate the strategy
+    on each chunk as a matrix and collect per-path statistics. Every chunk has its
+    own seeded RNG stream, so results do not depend on `workers`. `sampling`
+    selects a variance-reduction scheme (see PriceLoader.iter_paths).
+
+    Sobol estimates get their standard error from the spread of independently
+    scrambled chunks, so sobol runs need n_paths >= 2 * chunk_size (at least
+    two replicates; more give a steadier error estimate).
+    """
+    if n_paths <= 0 or n_steps <= 0:
+        raise ValueError("n_paths and n_steps must be positive")
+    rows = _chunk_rows(n_paths, chunk_size, sampling)
+    if sampling == "sobol" and len(rows) < 2:
+        raise ValueError("sobol sampling needs at least 2 chunks to estimate the standard error; "
+                         "use a smaller chunk_size")
+
+    n_chunks = len(rows)
+    price_kw = {"start_price": start_price, "drift": drift, "vol": vol, "sampling": sampling}
+    jobs = [
+        (ss, n, n_steps, price_kw, strategy, cash, qty)
+        for n, ss in zip(rows, PriceLoader(seed).chunk_seeds(n_chunks))
+    ]
+
+    if workers > 1 and n_chunks > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_run_chunk, jobs))
+    else:
+        parts = [_run_chunk(job) for job in jobs]
+
+    final_equity, mdd, trades, rejected = (np.concatenate(x) for x in zip(*parts))
+    chunk_id = np.repeat(np.arange(n_chunks), [job[1] for job in jobs])
+    return MonteCarloResult(final_equity, mdd, trades, rejected, chunk_id, sampling)
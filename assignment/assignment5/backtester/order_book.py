@@ -0,0 +1,338 @@
+import csv
+from bisect import bisect_left, insort
+from collections import deque
+
+ANON = -1  # id of anonymous (L2) liquidity, not tracked individually
+
+
+class _Order:
+    __slots__ = ("oid", "side", "price", "qty")
+
+    def __init__(self, oid, side, price, qty):
+        self.oid = oid
+        self.side = side
+        self.price = price
+        self.qty = qty
+
+
+class OrderBook:
+    """
+    Price-level limit order book: one FIFO queue per price level, sorted level
+    prices per side and an id -> order map. Best bid/offer is O(1) (end of the
+    sorted level list), cancels are O(1) lazy removals from the queue; a
+    level's queue is compacted once more than half of it is cancelled entries.
+    on_fill(maker_id, taker_id, taker_side, price, qty) is called for every fill.
+    """
+    def __init__(self, on_fill=None):
+        self._levels = {"BUY": {}, "SELL": {}}     # price -> deque[_Order]
+        self._level_qty = {"BUY": {}, "SELL": {}}  # price -> resting qty
+        self._dead = {"BUY": {}, "SELL": {}}       # price -> zero-qty entries still queued
+        self._anon = {"BUY": {}, "SELL": {}}       # price -> live anonymous entry
+        self._bid_px = []   # ascending, best bid last
+        self._ask_key = []  # ascending -price, best ask last
+        self._orders = {}
+        self._next_id = 1
+        self.on_fill = on_fill
+
+    # ---- top of book -------------------------------------------------------
+    @property
+    def best_bid(self):
+        return self._bid_px[-1] if self._bid_px else None
+
+    @property
+    def best_ask(self):
+        return -self._ask_key[-1] if self._ask_key else None
+
+    def depth(self, side: str, n: int = 5):
+        """Top n (price, qty) levels of one side, best first."""
+        if side == "BUY":
+            prices = self._bid_px[-n:][::-1]
+        else:
+            prices = [-k for k in self._ask_key[-n:][::-1]]
+        return [(p, self._level_qty[side][p]) for p in prices]
+
+    def __contains__(self, oid):
+        return oid in self._orders
+
+    # ---- level bookkeeping --------------------------------------------------
+    def _new_id(self):
+        oid = self._next_id
+        self._next_id += 1
+        return oid
+
+    def _rest(self, o: _Order):
+        levels = self._levels[o.side]
+        q = levels.get(o.price)
+        if q is None:
+            q = levels[o.price] = deque()
+            self._level_qty[o.side][o.price] = 0
+            if o.side == "BUY":
+                insort(self._bid_px, o.price)
+            else:
+                insort(self._ask_key, -o.price)
+        q.append(o)
+        self._level_qty[o.side][o.price] += o.qty
+        if o.oid != ANON:
+            self._orders[o.oid] = o
+
+    def _drop_level(self, side, price):
+        del self._levels[side][price]
+        del self._level_qty[side][price]
+        self._dead[side].pop(price, None)
+        self._anon[side].pop(price, None)
+        keys, key = (self._bid_px, price) if side == "BUY" else (self._ask_key, -price)
+        if keys and keys[-1] == key:
+            keys.pop()
+        else:
+            del keys[bisect_left(keys, key)]
+
+    def _retire(self, side, price):
+        """An entry at `price` was zeroed in place; compact the queue if dead ones dominate."""
+        dead = self._dead[side]
+        n = dead.get(price, 0) + 1
+        q = self._levels[side][price]
+        if n > 8 and 2 * n > len(q):
+            self._levels[side][price] = deque(o for o in q if o.qty)
+            n = 0
+        dead[price] = n
+
+    def _match(self, side, qty, limit, taker_id):
+        """Take liquidity from the opposite side up to `limit` (None = market)."""
+        opp = "SELL" if side == "BUY" else "BUY"
+        keys = self._ask_key if side == "BUY" else self._bid_px
+        levels, level_qty, dead = self._levels[opp], self._level_qty[opp], self._dead[opp]
+        on_fill, orders = self.on_fill, self._orders
+        fills = []
+        while qty and keys:
+            price = -keys[-1] if side == "BUY" else keys[-1]
+            if limit is not None and (price > limit if side == "BUY" else price < limit):
+                break
+            q = levels[price]
+            while qty and q:
+                o = q[0]
+                if not o.qty:  # lazily cancelled
+                    q.popleft()
+                    dead[price] -= 1
+                    continue
+                trade = o.qty if o.qty < qty else qty
+                o.qty -= trade
+                qty -= trade
+                level_qty[price] -= trade
+                if not o.qty:
+                    q.popleft()
+                    orders.pop(o.oid, None)
+                fills.append((o.oid, taker_id, price, trade))
+                if on_fill is not None:
+                    on_fill(o.oid, taker_id, side, price, trade)
+            if not level_qty[price]:
+                self._drop_level(opp, price)
+        return qty, fills
+
+    # ---- order entry --------------------------------------------------------
+    def limit(self, side: str, qty: int, price: float, order_id=None):
+        """Match what crosses, rest the remainder. Returns (order_id, fills)."""
+        if side not in ("BUY", "SELL"):
+            raise ValueError("side must be BUY or SELL")
+        if qty <= 0:
+            raise ValueError("qty must be positive")
+        if price <= 0:
+            raise ValueError("price must be positive")
+        if order_id is None:
+            oid = self._new_id()
+        else:
+            oid = order_id
+            if oid in self._orders:
+                raise ValueError(f"duplicate order id {oid}")
+            if oid >= self._next_id:
+                self._next_id = oid + 1
+        left, fills = self._match(side, qty, price, oid)
+        if left:
+            self._rest(_Order(oid, side, price, left))
+        return oid, fills
+
+    def market(self, side: str, qty: int, order_id=None):
+        """Immediate-or-cancel against the book. Returns (unfilled qty, fills)."""
+        if side not in ("BUY", "SELL"):
+            raise ValueError("side must be BUY or SELL")
+        if qty <= 0:
+            raise ValueError("qty must be positive")
+        oid = self._new_id() if order_id is None else order_id
+        return self._match(side, qty, None, oid)
+
+    def cancel(self, order_id) -> bool:
+        o = self._orders.pop(order_id, None)
+        if o is None:
+            return False
+        level_qty = self._level_qty[o.side]
+        level_qty[o.price] -= o.qty
+        o.qty = 0  # left in the queue, skipped when it reaches the front
+        if not level_qty[o.price]:
+            self._drop_level(o.side, o.price)
+        else:
+            self._retire(o.side, o.price)
+        return True
+
+    def set_level(self, side: str, price: float, qty: int):
+        """
+        L2 update: the anonymous size at `price` becomes `qty`. Tracked (own)
+        orders at that level keep their queue position ahead of the new size.
+        """
+        old = self._anon[side].pop(price, None)
+        if old is not None and old.qty:
+            level_qty = self._level_qty[side]
+            level_qty[price] -= old.qty
+            old.qty = 0
+            if level_qty[price]:
+                self._retire(side, price)
+            else:
+                self._drop_level(side, price)
+        if qty > 0:
+            o = _Order(ANON, side, price, qty)
+            self._rest(o)
+            self._anon[side][price] = o
+
+    def quote_cost(self, side: str, qty: int):
+        """(fillable qty, notional) of a market order, without executing it."""
+        if side == "BUY":
+            keys, level_qty, sign = self._ask_key, self._level_qty["SELL"], -1
+        else:
+            keys, level_qty, sign = self._bid_px, self._level_qty["BUY"], 1
+        filled, notional = 0, 0.0
+        i = len(keys)
+        while filled < qty and i:  # best level first, stop once filled
+            i -= 1
+            price = sign * keys[i]
+            take = min(level_qty[price], qty - filled)
+            filled += take
+            notional += take * price
+        return filled, notional
+
+    # ---- replay -------------------------------------------------------------
+    def apply(self, event):
+        """
+        One book event (type, side, price, qty, order_id):
+        ADD = L3 limit order, CANCEL, MARKET, LEVEL = L2 size update.
+        """
+        kind, side, price, qty, oid = event
+        if kind == "ADD":
+            return self.limit(side, qty, price, oid)
+        if kind == "CANCEL":
+            return self.cancel(oid)
+        if kind == "MARKET":
+            return self.market(side, qty, oid)
+        if kind == "LEVEL":
+            return self.set_level(side, price, qty)
+        raise ValueError(f"unknown event type: {kind}")
+
+    def replay(self, events) -> int:
+        n = 0
+        apply = self.apply
+        for ev in events:
+            apply(ev)
+            n += 1
+        return n
+
+
+def load_events(path):
+    """Stream events from a CSV with columns type,side,price,qty,order_id."""
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            price = row.get("price")
+            oid = row.get("order_id")
+            yield (
+                row["type"].upper(),
+                (row.get("side") or "").upper() or None,
+                float(price) if price else None,
+                int(row["qty"]) if row.get("qty") else 0,
+                int(oid) if oid else None,
+            )
+
+
+class BookBroker:
+    """
+    Broker backed by an OrderBook: same cash/position/market_order interface as
+    Broker, so Backtester can drive it, plus resting limit orders that fill when
+    later book events trade against them. Market orders take liquidity from the
+    book (the `price` argument is only validated) and any unfilled rest is dropped.
+    """
+    def __init__(self, book: OrderBook, cash: float = 1_000_000):
+        self.book = book
+        self.cash = cash
+        self.position = 0
+        self.reserved_cash = 0.0
+        self.reserved_shares = 0
+        self._mine = {}  # own order id -> side
+        book.on_fill = self._on_fill
+
+    def _on_fill(self, maker_id, taker_id, taker_side, price, qty):
+        # both legs are booked when our order trades against our own resting
+        # order, which leaves cash and position unchanged
+        if maker_id in self._mine:
+            side = self._mine[maker_id]
+            if side == "BUY":
+                self.reserved_cash -= qty * price
+            else:
+                self.reserved_shares -= qty
+            if maker_id not in self.book:
+                del self._mine[maker_id]
+            self._book_fill(side, qty, price)
+        if taker_id in self._mine:
+            self._book_fill(taker_side, qty, price)
+
+    def _book_fill(self, side, qty, price):
+        if side == "BUY":
+            self.cash -= qty * price
+            self.position += qty
+        else:
+            self.cash += qty * price
+            self.position -= qty
+
+    def _check(self, side, qty, price):
+        if side not in ("BUY", "SELL"):
+            raise ValueError("side must be BUY or SELL")
+        if qty <= 0:
+            raise ValueError("qty must be positive")
+        if price <= 0:
+            raise ValueError("price must be positive")
+        if side == "SELL" and qty > self.position - self.reserved_shares:
+            raise RuntimeError("insufficient shares")
+
+    def market_order(self, side: str, qty: int, price: float):
+        self._check(side, qty, price)
+        if side == "BUY":
+            _, cost = self.book.quote_cost(side, qty)
+            if cost > self.cash - self.reserved_cash:
+                raise RuntimeError("insufficient cash")
+        oid = self.book._new_id()
+        self._mine[oid] = side
+        left, _ = self.book.market(side, qty, oid)
+        del self._mine[oid]
+        return qty - left
+
+    def limit_order(self, side: str, qty: int, price: float):
+        self._check(side, qty, price)
+        if side == "BUY" and qty * price > self.cash - self.reserved_cash:
+            raise RuntimeError("insufficient cash")
+        oid = self.book._new_id()
+        self._mine[oid] = side
+        _, fills = self.book.limit(side, qty, price, oid)
+        rest = qty - sum(f[3] for f in fills)
+        if rest:
+            if side == "BUY":
+                self.reserved_cash += rest * price
+            else:
+                self.reserved_shares += rest
+        else:
+            del self._mine[oid]
+        return oid
+
+    def cancel(self, order_id) -> bool:
+        o = self.book._orders.get(order_id)
+        if o is None or order_id not in self._mine:
+            return False
+        if o.side == "BUY":
+            self.reserved_cash -= o.qty * o.price
+        else:
+            self.reserved_shares -= o.qty
+        del self._mine[order_id]
+        return self.book.cancel(order_id)
@@ -1,8 +1,73 @@
 import pandas as pd
 import numpy as np
 
+SAMPLING_METHODS = ("plain", "antithetic", "moment", "sobol")
+
+def _normals(seed_seq, n_paths, n_steps, sampling="plain"):
+    rng = np.random.default_rng(seed_seq)
+    if sampling == "plain":
+        return rng.standard_normal((n_paths, n_steps))
+    if sampling == "antithetic":
+        # rows 2k and 2k+1 are a (z, -z) pair
+        if n_paths % 2:
+            raise ValueError("antithetic sampling needs an even number of paths per chunk")
+        z = np.empty((n_paths, n_steps))
+        z[0::2] = rng.standard_normal((n_paths // 2, n_steps))
+        z[1::2] = -z[0::2]
+        return z
+    if sampling == "moment":
+        # every time step gets exactly mean 0 / variance 1 across the paths
+        if n_paths < 2:
+            raise ValueError("moment matching needs at least 2 paths per chunk")
+        z = rng.standard_normal((n_paths, n_steps))
+        return (z - z.mean(axis=0)) / z.std(axis=0)
+    if sampling == "sobol":
+        try:
+            from scipy.special import ndtri
+            from scipy.stats import qmc
+        except ImportError as e:
+            raise ImportError("sobol sampling requires scipy") from e
+        u = qmc.Sobol(d=n_steps, scramble=True, seed=rng).random(n_paths)
+        eps = np.finfo(float).eps
+        return ndtri(np.clip(u, eps, 1.0 - eps))
+    raise ValueError(f"unknown sampling: {sampling}")
+
+def _chunk_rows(n_paths, chunk_size, sampling="plain"):
+    """
+    Rows per chunk, checked up front so a bad layout fails before any path is drawn.
+    antithetic: every chunk must be even. moment: chunks need at least 2 rows, so a
+    1-row remainder is folded into the previous chunk. sobol: chunks must be one power-of-two size (scipy's
+    balance properties), so n_paths has to be a multiple of chunk_size.
+    """
+    if n_paths <= 0 or chunk_size <= 0:
+        raise ValueError("n_paths and chunk_size must be positive")
+    if sampling not in SAMPLING_METHODS:
+        raise ValueError(f"unknown sampling: {sampling}")
+    chunk_size = min(chunk_size, n_paths)
+    full, rest = divmod(n_paths, chunk_size)
+    rows = [chunk_size] * full + ([rest] if rest else [])
+    if sampling == "antithetic" and any(r % 2 for r in rows):
+        raise ValueError("antithetic sampling needs even n_paths and chunk_size")
+    if sampling == "moment":
+        if chunk_size < 2:
+            raise ValueError("moment matching needs at least 2 paths per chunk")
+        if rows[-1] == 1:
+            rows.pop()
+            rows[-1] += 1
+    if sampling == "sobol":
+        if chunk_size & (chunk_size - 1):
+            raise ValueError("sobol sampling needs a power-of-two chunk_size")
+        if rest:
+            raise ValueError("sobol sampling needs n_paths to be a multiple of chunk_size")
+    return rows
+
+def _gbm_chunk(seed_seq, n_paths, n_steps, start_price, drift, vol, sampling="plain"):
+    returns = drift + vol * _normals(seed_seq, n_paths, n_steps, sampling)
+    return start_price * np.exp(np.cumsum(returns, axis=1))
+
 class PriceLoader:
     def __init__(self, seed: int=42):
+        self.seed = seed
         self.rng = np.random.default_rng(seed)
 
     def load(self, n, start_price: float = 100.0, drift: float = 0.0003, vol: float = 0.01):
@@ -11,4 +76,29 @@ class PriceLoader:
         returns = drift + vol * self.rng.standard_normal(n)
         prices = start_price * np.exp(np.cumsum(returns))
         return pd.Series(prices)
-        
\ No newline at end of file
+
+    def chunk_seeds(self, n_chunks: int):
+        # chunk i always gets the same child stream, whatever the chunking is run on
+        return [np.random.SeedSequence(self.seed, spawn_key=(i,)) for i in range(n_chunks)]
+
+    def iter_paths(self, n_paths, n_steps, chunk_size: int = 1024, start_price: float = 100.0,
+                   drift: float = 0.0003, vol: float = 0.01, sampling: str = "plain"):
+        """
+        Yield (chunk_paths x n_steps) GBM price matrices, one independent RNG stream per chunk.
+        sampling: "plain", "antithetic" (paired rows), "moment" (moment-matched normals
+        per step) or "sobol" (scrambled Sobol points, needs scipy; one scramble per chunk).
+        The arguments and chunk layout are validated when this is called, not on
+        the first next() (see _chunk_rows).
+        """
+        if n_paths <= 0 or n_steps <= 0:
+            raise ValueError('n_paths and n_steps must be positive')
+        rows = _chunk_rows(n_paths, chunk_size, sampling)
+        return self._iter_chunks(rows, n_steps, start_price, drift, vol, sampling)
+
+    def _iter_chunks(self, rows, n_steps, start_price, drift, vol, sampling):
+        for n, ss in zip(rows, self.chunk_seeds(len(rows))):
+            yield _gbm_chunk(ss, n, n_steps, start_price, drift, vol, sampling)
+
+    def load_paths(self, n_paths, n_steps, chunk_size: int = 1024, **kwargs):
+        """Full (n_paths x n_steps) matrix; use iter_paths to stay memory-bounded."""
+        return np.vstack(list(self.iter_paths(n_paths, n_steps, chunk_size, **kwargs)))
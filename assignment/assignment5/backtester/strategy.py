@@ -1,11 +1,115 @@
+import math
+from collections import deque
+
 import pandas as pd
 import numpy as np
 
+# _OnlineVol rebuilds its moments from the window this often to bound drift
+RESYNC_EVERY = 4096
+
+def resync_interval(window: int) -> int:
+    return max(RESYNC_EVERY, 16 * window)
+
+def _rolling_std_rows(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Row-wise rolling sample std (ddof=1) from cumulative sums; first window-1
+    columns are NaN. Each row is demeaned first, so the sum-of-squares formula
+    does not cancel catastrophically when the values sit far from zero.
+    """
+    x = x - x.mean(axis=1, keepdims=True)
+    c1 = np.zeros((x.shape[0], x.shape[1] + 1))
+    c2 = np.zeros_like(c1)
+    np.cumsum(x, axis=1, out=c1[:, 1:])
+    np.cumsum(x * x, axis=1, out=c2[:, 1:])
+    s1 = c1[:, window:] - c1[:, :-window]
+    s2 = c2[:, window:] - c2[:, :-window]
+    var = np.maximum((s2 - s1 * s1 / window) / (window - 1), 0.0)
+    out = np.full(x.shape, np.nan)
+    out[:, window - 1:] = np.sqrt(var)
+    return out
+
+class _OnlineVol:
+    """
+    Sample std (ddof=1) of the last `window` values in O(1) per update
+    (Welford add/remove, exact resync now and then). Undefined (NaN) while a
+    NaN is inside the window, like pandas rolling(window).std().
+    """
+    def __init__(self, window: int):
+        self.window = window
+        self.q = deque(maxlen=window)
+        self.n = 0
+        self.nans = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._since_sync = 0
+        self._resync_every = resync_interval(window)
+
+    def add(self, x: float):
+        if len(self.q) == self.window:
+            old = self.q[0]
+            if old != old:
+                self.nans -= 1
+            elif self.n == 1:
+                self.n, self.mean, self.m2 = 0, 0.0, 0.0
+            else:
+                delta = old - self.mean
+                self.n -= 1
+                self.mean -= delta / self.n
+                self.m2 -= delta * (old - self.mean)
+        self.q.append(x)
+        if x != x:
+            self.nans += 1
+        else:
+            self.n += 1
+            delta = x - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (x - self.mean)
+
+        self._since_sync += 1
+        if self._since_sync >= self._resync_every:
+            self._since_sync = 0
+            vals = [v for v in self.q if v == v]
+            self.mean = math.fsum(vals) / len(vals) if vals else 0.0
+            self.m2 = math.fsum((v - self.mean) ** 2 for v in vals)
+
+    @property
+    def std(self) -> float:
+        if self.nans or self.n < 2 or len(self.q) < self.window:
+            return float("nan")
+        return math.sqrt(max(self.m2, 0.0) / (self.n - 1))
+
 class VolatilityBreakoutStrategy:
     def __init__(self, lookback: int = 20):
         if lookback <= 1:
             raise ValueError("lookback must be > 1")
         self.lookback = lookback
+        self.reset()
+
+    def reset(self):
+        """Clear the streaming state used by update()."""
+        self._vol = _OnlineVol(self.lookback)
+        self._prev = None
+        self._t = 0
+
+    def update(self, price: float) -> int:
+        """
+        Streaming signals(): feed prices one at a time and get the signal for the
+        latest one, in O(1) per price. Matches signals() on the same series.
+        """
+        price = float(price)
+        t, prev = self._t, self._prev
+        self._t += 1
+        self._prev = price
+        r = float("nan") if prev is None else price / prev - 1.0
+        self._vol.add(r)
+        if t < self.lookback:
+            return 0
+        vol = self._vol.std
+        if r > vol:
+            return 1
+        if r < -vol:
+            return -1
+        return 0
 
     def signals(self, prices: pd.Series):
         if not isinstance(prices, pd.Series):
@@ -20,4 +124,59 @@ class VolatilityBreakoutStrategy:
         sigs[r > vol] = 1
         sigs[r < -vol] = -1
         sigs.iloc[: self.lookback] = 0
-        return sigs
\ No newline at end of file
+        return sigs
+
+    def signals_matrix(self, prices: np.ndarray) -> np.ndarray:
+        """
+        2-D version of signals() for an (n_paths x n_steps) price matrix: every
+        row gets the same rule, computed with one rolling kernel over all paths.
+        """
+        prices = np.asarray(prices, dtype=float)
+        if prices.ndim != 2:
+            raise ValueError("prices must be a 2-D (paths x steps) array")
+        sigs = np.zeros(prices.shape, dtype=np.int8)
+        if prices.shape[1] <= self.lookback:
+            return sigs
+
+        r = prices[:, 1:] / prices[:, :-1] - 1.0
+        vol = _rolling_std_rows(r, self.lookback)
+        r, vol = r[:, self.lookback - 1:], vol[:, self.lookback - 1:]
+        tail = sigs[:, self.lookback:]
+        tail[r > vol] = 1
+        tail[r < -vol] = -1
+        return sigs
+
+    @staticmethod
+    def sweep_signals(prices, lookbacks) -> np.ndarray:
+        """
+        signals() for many lookbacks in one pass: every rolling volatility is read
+        off one shared pair of cumulative sums of returns and squared returns.
+        Returns a (len(lookbacks) x len(prices)) int8 matrix, row i for lookbacks[i].
+        """
+        p = np.asarray(prices, dtype=float)
+        if p.ndim != 1:
+            raise ValueError("prices must be 1-D")
+        w = np.asarray(lookbacks, dtype=np.int64).reshape(-1, 1)
+        if (w <= 1).any():
+            raise ValueError("lookback must be > 1")
+        sigs = np.zeros((len(w), len(p)), dtype=np.int8)
+        if len(p) < 2:
+            return sigs
+
+        r = p[1:] / p[:-1] - 1.0
+        c1 = np.concatenate(([0.0], np.cumsum(r)))
+        c2 = np.concatenate(([0.0], np.cumsum(r * r)))
+
+        end = np.arange(1, len(r) + 1)[None, :]  # cumsum index just past return j
+        start = end - w
+        ok = start >= 0  # same as t >= lookback for price index t = end
+        start = np.maximum(start, 0)
+        s1 = c1[end] - c1[start]
+        s2 = c2[end] - c2[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vol = np.sqrt(np.maximum((s2 - s1 * s1 / w) / (w - 1), 0.0))
+
+        tail = sigs[:, 1:]
+        tail[ok & (r > vol)] = 1
+        tail[ok & (r < -vol)] = -1
+        return sigs
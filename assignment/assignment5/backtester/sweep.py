@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from .monte_carlo import backtest_paths
+from .strategy import VolatilityBreakoutStrategy
+
+
+def sweep_lookbacks(prices, lookbacks, cash: float = 1_000_000, qty: int = 1, position: int = 0) -> pd.DataFrame:
+    """
+    Backtest VolatilityBreakoutStrategy for every lookback at once on one price
+    series: one signal matrix from sweep_signals, one matrix backtest. Orders that
+    break the Broker rules are rejected and counted, as in run_monte_carlo.
+    Returns one row per lookback.
+    """
+    lookbacks = list(lookbacks)
+    p = np.asarray(prices, dtype=float)
+    sigs = VolatilityBreakoutStrategy.sweep_signals(p, lookbacks)
+    grid = np.broadcast_to(p, sigs.shape)
+    equity, mdd, trades, rejected = backtest_paths(sigs, grid, cash=cash, qty=qty, position=position)
+    return pd.DataFrame(
+        {"final_equity": equity, "max_drawdown": mdd, "trades": trades, "rejected": rejected},
+        index=pd.Index(lookbacks, name="lookback"),
+    )
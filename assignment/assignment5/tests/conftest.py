@@ -14,4 +14,19 @@ def strategy():
 
 @pytest.fixture
 def broker():
-    return Broker(cash=1_000)
\ No newline at end of file
+    return Broker(cash=1_000)
+
+def pytest_addoption(parser):
+    parser.addoption("--run-perf", action="store_true", default=False,
+                     help="run the performance-budget tests (marked 'perf')")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: performance-budget test, opt-in via --run-perf")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-perf"):
+        return
+    skip = pytest.mark.skip(reason="performance test; use --run-perf")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip)
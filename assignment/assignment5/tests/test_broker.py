@@ -1,6 +1,8 @@
 # tests/test_broker.py
+import numpy as np
 import pytest
-from backtester.broker import Broker
+from backtester.broker import (Broker, MultiAssetBroker, FILLED, BAD_SIDE, BAD_QTY, BAD_PRICE,
+                               UNKNOWN_SYMBOL, INSUFFICIENT_CASH, INSUFFICIENT_SHARES)
 
 def test_buy_and_sell_updates_cash_and_pos(broker):
     broker.market_order("BUY", 2, 10.0)
@@ -24,3 +26,28 @@ def test_insufficient_cash_or_shares():
     b = Broker(cash=100)
     with pytest.raises(RuntimeError):
         b.market_order("SELL", 1, 10)
+
+def test_multi_asset_batch_fills_and_codes():
+    b = MultiAssetBroker(["AAA", "BBB"], cash=100)
+    codes = b.submit_batch(["BUY", "BUY", "X", "BUY", "BUY", "BUY"],
+                           [2, 3, 1, 0, 1, 1],
+                           [10.0, 20.0, 10.0, 10.0, -1.0, 5.0],
+                           [0, 1, 0, 0, 0, 7])
+    assert codes.tolist() == [FILLED, FILLED, BAD_SIDE, BAD_QTY, BAD_PRICE, UNKNOWN_SYMBOL]
+    assert b.position.tolist() == [2, 3]
+    assert b.cash == 100 - 20 - 60
+
+    # sells run first, so their proceeds fund the buy; the second AAA sell overdraws
+    codes = b.submit_batch([1, -1, -1, -1], [1, 2, 1, 3], [30.0, 10.0, 10.0, 20.0], [0, 0, 0, 1])
+    assert codes.tolist() == [FILLED, FILLED, INSUFFICIENT_SHARES, FILLED]
+    assert b.position.tolist() == [1, 0]
+    assert b.cash == 20 + 20 + 60 - 30
+
+    codes = b.submit_batch(["BUY", "BUY"], [1, 1], [80.0, 1.0], [1, 1])
+    assert codes.tolist() == [INSUFFICIENT_CASH, INSUFFICIENT_CASH]  # first misfit stops the group
+    assert b.equity(np.array([10.0, 5.0])) == b.cash + 10.0
+
+def test_multi_asset_batch_length_mismatch():
+    b = MultiAssetBroker(["AAA"])
+    with pytest.raises(ValueError):
+        b.submit_batch(["BUY"], [1, 2], [1.0], [0])
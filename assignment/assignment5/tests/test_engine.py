@@ -2,7 +2,10 @@
 import pytest
 import pandas as pd
 from unittest.mock import MagicMock
+from backtester.broker import Broker
 from backtester.engine import Backtester
+from backtester.price_loader import PriceLoader
+from backtester.strategy import VolatilityBreakoutStrategy
 
 # example
 def test_engine_uses_tminus1_signal(prices, broker, strategy, monkeypatch):
@@ -45,4 +48,51 @@ def test_engine_signal_length_mismatch(prices, broker):
     fake_strategy = MagicMock()
     fake_strategy.signals.return_value = pd.Series([1, 0])
     with pytest.raises(ValueError, match="signals must align with prices"):
-        Backtester(fake_strategy, broker).run(prices)
\ No newline at end of file
+        Backtester(fake_strategy, broker).run(prices)
+
+def test_vectorized_run_matches_loop():
+    prices = PriceLoader(seed=7).load(2_000, vol=0.02)
+    loop_broker, vec_broker = Broker(cash=10_000), Broker(cash=10_000)
+    loop_broker.position = vec_broker.position = 500  # enough inventory for every SELL
+    loop_eq = Backtester(VolatilityBreakoutStrategy(lookback=10), loop_broker, qty=2).run(prices)
+    vec_eq, curve = Backtester(VolatilityBreakoutStrategy(lookback=10), vec_broker, qty=2).run_vectorized(prices)
+
+    assert vec_eq == loop_eq
+    assert (vec_broker.cash, vec_broker.position) == (loop_broker.cash, loop_broker.position)
+    assert len(curve) == len(prices)
+    assert curve.iloc[-1] == pytest.approx(vec_eq)
+    assert curve.iloc[0] == pytest.approx(10_000 + 500 * prices.iloc[0])
+
+def test_vectorized_run_fails_at_same_index(prices):
+    fake_strategy = MagicMock()
+    sigs = prices * 0
+    sigs.iloc[3:] = 1  # keeps buying until cash runs out
+    fake_strategy.signals.return_value = sigs
+
+    loop_broker, vec_broker = Broker(cash=1_000), Broker(cash=1_000)
+    with pytest.raises(RuntimeError, match="insufficient cash"):
+        Backtester(fake_strategy, loop_broker, qty=1).run(prices)
+    with pytest.raises(RuntimeError, match="insufficient cash") as exc:
+        Backtester(fake_strategy, vec_broker, qty=1).run_vectorized(prices)
+
+    assert (vec_broker.cash, vec_broker.position) == (loop_broker.cash, loop_broker.position)
+    assert f"t={4 + loop_broker.position}" in str(exc.value)
+
+def test_vectorized_run_insufficient_shares(prices, broker):
+    fake_strategy = MagicMock()
+    sigs = prices * 0
+    sigs.iloc[5] = -1
+    fake_strategy.signals.return_value = sigs
+    with pytest.raises(RuntimeError, match=r"insufficient shares \(t=6\)"):
+        Backtester(fake_strategy, broker).run_vectorized(prices)
+
+def test_step_matches_run():
+    prices = PriceLoader(seed=8).load(1_500, vol=0.02)
+    batch_broker, live_broker = Broker(cash=10_000), Broker(cash=10_000)
+    batch_broker.position = live_broker.position = 500
+    batch_eq = Backtester(VolatilityBreakoutStrategy(lookback=15), batch_broker).run(prices)
+
+    live = Backtester(VolatilityBreakoutStrategy(lookback=15), live_broker)
+    curve = [live.step(p) for p in prices]
+    assert curve[-1] == batch_eq
+    assert (live_broker.cash, live_broker.position) == (batch_broker.cash, batch_broker.position)
@@ -0,0 +1,121 @@
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.monte_carlo import backtest_paths, run_monte_carlo
+from backtester.price_loader import PriceLoader, _normals
+from backtester.strategy import VolatilityBreakoutStrategy, _rolling_std_rows
+
+def test_load_paths_shape_and_reproducible():
+    a = PriceLoader(seed=1).load_paths(10, 30, chunk_size=3)
+    b = PriceLoader(seed=1).load_paths(10, 30, chunk_size=3)
+    assert a.shape == (10, 30)
+    assert np.array_equal(a, b)
+    assert not np.array_equal(a[0], a[3])  # different chunk streams
+
+def test_load_paths_rejects_bad_sizes():
+    with pytest.raises(ValueError):
+        PriceLoader().load_paths(0, 10)
+    with pytest.raises(ValueError):
+        PriceLoader().load_paths(5, 10, chunk_size=0)
+
+def test_signals_matrix_matches_series_signals():
+    strat = VolatilityBreakoutStrategy(lookback=10)
+    paths = PriceLoader(seed=3).load_paths(8, 300)
+    expected = np.vstack([strat.signals(pd.Series(row)).to_numpy() for row in paths])
+    assert np.array_equal(strat.signals_matrix(paths), expected)
+
+def test_signals_matrix_short_and_bad_input():
+    strat = VolatilityBreakoutStrategy(lookback=5)
+    assert not strat.signals_matrix(np.ones((2, 5))).any()
+    with pytest.raises(ValueError):
+        strat.signals_matrix(np.ones(5))
+
+def test_rolling_std_rows_far_from_zero():
+    rng = np.random.default_rng(0)
+    x = 1e9 + rng.standard_normal((3, 500))
+    exact = np.lib.stride_tricks.sliding_window_view(x, 20, axis=1).std(axis=-1, ddof=1)  # two-pass
+    out = _rolling_std_rows(x, 20)
+    assert np.isnan(out[:, :19]).all()
+    assert np.allclose(out[:, 19:], exact, rtol=1e-9)
+
+def test_backtest_paths_matches_backtester():
+    strat = VolatilityBreakoutStrategy(lookback=10)
+    paths = PriceLoader(seed=5).load_paths(4, 400, vol=0.02)
+    eq, mdd, trades, rejected = backtest_paths(strat.signals_matrix(paths), paths,
+                                               cash=50_000, qty=2, position=500)
+    for i, row in enumerate(paths):
+        broker = Broker(cash=50_000)
+        broker.position = 500
+        assert eq[i] == Backtester(strat, broker, qty=2).run(pd.Series(row))
+    assert (rejected == 0).all()
+    assert (trades > 0).all()
+    assert (mdd <= 0).all()
+
+def test_backtest_paths_zero_equity_has_no_drawdown():
+    prices = np.full((2, 5), 10.0)
+    sigs = np.ones((2, 5), dtype=np.int8)  # every buy is rejected: no cash
+    with np.errstate(all="raise"):
+        eq, mdd, trades, rejected = backtest_paths(sigs, prices, cash=0.0)
+    assert (eq == 0).all() and (mdd == 0).all()
+    assert (trades == 0).all() and (rejected == 4).all()
+
+def test_run_monte_carlo_independent_of_workers():
+    strat = VolatilityBreakoutStrategy(lookback=10)
+    serial = run_monte_carlo(strat, n_paths=40, n_steps=120, seed=9, chunk_size=16)
+    pooled = run_monte_carlo(strat, n_paths=40, n_steps=120, seed=9, chunk_size=16, workers=2)
+    assert len(serial.final_equity) == 40
+    assert np.array_equal(serial.final_equity, pooled.final_equity)
+    assert np.array_equal(serial.trades, pooled.trades)
+    assert set(serial.summary()) == {"final_equity", "max_drawdown", "trades"}
+
+def test_antithetic_and_moment_normals():
+    ss = np.random.SeedSequence(0)
+    z = _normals(ss, 6, 50, "antithetic")
+    assert np.array_equal(z[1::2], -z[0::2])
+    with pytest.raises(ValueError):
+        _normals(ss, 5, 50, "antithetic")
+
+    z = _normals(ss, 64, 20, "moment")
+    assert np.allclose(z.mean(axis=0), 0.0)
+    assert np.allclose(z.std(axis=0), 1.0)
+
+def test_unknown_sampling_rejected():
+    with pytest.raises(ValueError, match="unknown sampling"):
+        PriceLoader().load_paths(4, 10, sampling="halton")
+    with pytest.raises(ValueError):
+        run_monte_carlo(VolatilityBreakoutStrategy(), n_paths=5, n_steps=30, chunk_size=4, sampling="antithetic")
+
+def test_chunk_layout_validated_up_front():
+    strat = VolatilityBreakoutStrategy(lookback=5)
+    res = run_monte_carlo(strat, n_paths=33, n_steps=30, chunk_size=32, sampling="moment")
+    assert len(res.final_equity) == 33 and set(res.chunk_id) == {0}  # 1-row remainder folded in
+    with pytest.raises(ValueError, match="power-of-two"):
+        run_monte_carlo(strat, n_paths=96, n_steps=30, chunk_size=48, sampling="sobol")
+    with pytest.raises(ValueError, match="multiple of chunk_size"):
+        run_monte_carlo(strat, n_paths=33, n_steps=30, chunk_size=32, sampling="sobol")
+    with pytest.raises(ValueError, match="at least 2 chunks"):
+        run_monte_carlo(strat, n_paths=64, n_steps=30, sampling="sobol")
+    with pytest.raises(ValueError):
+        PriceLoader().load_paths(1, 10, sampling="moment")
+
+def test_iter_paths_validates_on_call():
+    with pytest.raises(ValueError, match="at least 2 paths per chunk"):
+        PriceLoader().iter_paths(5, 10, chunk_size=1, sampling="moment")  # no next() needed
+    with pytest.raises(ValueError):
+        PriceLoader().iter_paths(4, 0)
+    assert len(PriceLoader().load_paths(5, 10, chunk_size=2, sampling="moment")) == 5
+
+@pytest.mark.parametrize("sampling", ["plain", "antithetic", "moment", "sobol"])
+def test_monte_carlo_reports_standard_error(sampling):
+    if sampling == "sobol":
+        pytest.importorskip("scipy")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # e.g. scipy's Sobol balance warning
+        res = run_monte_carlo(VolatilityBreakoutStrategy(lookback=10), n_paths=128, n_steps=60,
+                              chunk_size=32, sampling=sampling, vol=0.02)
+    se = res.summary()["final_equity"]["se"]
+    assert res.sampling == sampling
+    assert np.isfinite(se) and se > 0
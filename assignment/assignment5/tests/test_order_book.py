@@ -0,0 +1,125 @@
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+from backtester.engine import Backtester
+from backtester.order_book import OrderBook, BookBroker, load_events
+
+def test_limit_orders_rest_and_bbo():
+    book = OrderBook()
+    book.limit("BUY", 5, 99.0)
+    book.limit("BUY", 3, 99.5)
+    book.limit("SELL", 4, 101.0)
+    assert (book.best_bid, book.best_ask) == (99.5, 101.0)
+    assert book.depth("BUY") == [(99.5, 3), (99.0, 5)]
+
+def test_fifo_partial_fills_across_levels():
+    book = OrderBook()
+    a, _ = book.limit("SELL", 2, 100.0)
+    b, _ = book.limit("SELL", 3, 100.0)
+    c, _ = book.limit("SELL", 5, 101.0)
+    left, fills = book.market("BUY", 6)
+    assert left == 0
+    assert [(f[0], f[2], f[3]) for f in fills] == [(a, 100.0, 2), (b, 100.0, 3), (c, 101.0, 1)]
+    assert book.best_ask == 101.0 and book.depth("SELL") == [(101.0, 4)]
+
+def test_crossing_limit_rests_remainder_and_cancel():
+    book = OrderBook()
+    book.limit("SELL", 2, 100.0)
+    oid, fills = book.limit("BUY", 5, 100.5)
+    assert sum(f[3] for f in fills) == 2
+    assert book.best_bid == 100.5 and book.best_ask is None
+    assert book.cancel(oid)
+    assert not book.cancel(oid)
+    assert book.best_bid is None
+
+def test_cancel_keeps_queue_order():
+    book = OrderBook()
+    a, _ = book.limit("BUY", 1, 99.0)
+    b, _ = book.limit("BUY", 1, 99.0)
+    book.cancel(a)
+    _, fills = book.market("SELL", 1)
+    assert fills[0][0] == b
+
+def test_l2_level_updates():
+    book = OrderBook()
+    book.set_level("SELL", 100.0, 10)
+    book.set_level("SELL", 100.0, 4)
+    assert book.depth("SELL") == [(100.0, 4)]
+    book.set_level("SELL", 100.0, 0)
+    assert book.best_ask is None
+
+def test_l2_updates_keep_queue_bounded_behind_own_order():
+    book = OrderBook()
+    mine, _ = book.limit("SELL", 1, 100.0)
+    for i in range(5_000):
+        book.set_level("SELL", 100.0, i % 7 + 1)
+    assert len(book._levels["SELL"][100.0]) <= 20
+    assert book.depth("SELL") == [(100.0, 1 + 4_999 % 7 + 1)]
+    _, fills = book.market("BUY", 2)
+    assert fills[0][0] == mine  # still ahead of the anonymous size
+
+def test_quote_cost_walks_best_levels_only():
+    book = OrderBook()
+    for i in range(100):
+        book.set_level("SELL", 100.0 + i, 10)
+    assert book.quote_cost("BUY", 15) == (15, 10 * 100.0 + 5 * 101.0)
+    assert book.quote_cost("BUY", 5_000) == (1_000, sum(10 * (100.0 + i) for i in range(100)))
+    assert book.quote_cost("SELL", 5) == (0, 0.0)
+
+def test_replay_event_file(tmp_path):
+    path = tmp_path / "events.csv"
+    path.write_text(
+        "type,side,price,qty,order_id\n"
+        "ADD,BUY,99.0,5,1\n"
+        "ADD,SELL,101.0,5,2\n"
+        "MARKET,SELL,,2,\n"
+        "CANCEL,,,,2\n"
+        "LEVEL,SELL,102.0,7,\n"
+    )
+    book = OrderBook()
+    assert book.replay(load_events(path)) == 5
+    assert book.depth("BUY") == [(99.0, 3)]
+    assert book.depth("SELL") == [(102.0, 7)]
+    with pytest.raises(ValueError, match="unknown event"):
+        book.apply(("MODIFY", "BUY", 1.0, 1, 3))
+
+def test_book_broker_market_and_passive_fills():
+    book = OrderBook()
+    book.set_level("SELL", 10.0, 100)
+    broker = BookBroker(book, cash=1_000)
+    assert broker.market_order("BUY", 5, 10.0) == 5
+    assert (broker.position, broker.cash) == (5, 950.0)
+
+    oid = broker.limit_order("SELL", 3, 11.0)
+    assert broker.reserved_shares == 3
+    with pytest.raises(RuntimeError, match="insufficient shares"):
+        broker.market_order("SELL", 3, 10.0)
+    book.market("BUY", 100)  # sweeps the 10.0 level, then lifts our 11.0 offer
+    assert (broker.position, broker.cash) == (2, 983.0)
+    assert broker.reserved_shares == 0 and oid not in book
+
+    with pytest.raises(RuntimeError, match="insufficient cash"):
+        broker.limit_order("BUY", 1000, 5.0)
+    bid = broker.limit_order("BUY", 2, 5.0)
+    assert broker.cancel(bid) and broker.reserved_cash == 0
+
+def test_book_broker_self_match_books_both_legs():
+    book = OrderBook()
+    broker = BookBroker(book, cash=1_000)
+    broker.position = 10
+    broker.limit_order("SELL", 5, 10.0)
+    broker.limit_order("BUY", 5, 10.0)  # crosses our own offer
+    assert (broker.cash, broker.position) == (1_000, 10)
+    assert broker.reserved_shares == 0 and broker.reserved_cash == 0
+    assert book.best_bid is None and book.best_ask is None
+
+def test_backtester_drives_book_broker():
+    book = OrderBook()
+    book.set_level("SELL", 101.0, 10)
+    prices = pd.Series([100.0, 100.0, 100.0])
+    strat = MagicMock()
+    strat.signals.return_value = pd.Series([1, 0, 0])
+    broker = BookBroker(book, cash=1_000)
+    equity = Backtester(strat, broker).run(prices)
+    assert broker.position == 1 and broker.cash == 899.0
+    assert equity == 999.0
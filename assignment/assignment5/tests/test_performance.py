@@ -0,0 +1,73 @@
+# tests/test_performance.py
+# Opt-in scaling checks: pytest -q --run-perf
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.price_loader import PriceLoader
+from backtester.strategy import VolatilityBreakoutStrategy
+
+BUDGETS = json.loads((Path(__file__).parent / "perf_budgets.json").read_text())
+
+def _best_time(fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _scaling_exponent(sizes, times):
+    # slope of log(time) vs log(n): ~1 for linear, ~2 for quadratic
+    slope, _ = np.polyfit(np.log(sizes), np.log(times), 1)
+    return float(slope)
+
+def _bench_load(n):
+    loader = PriceLoader(seed=0)
+    return lambda: loader.load(n)
+
+def _bench_signals(n):
+    prices = PriceLoader(seed=0).load(n)
+    strat = VolatilityBreakoutStrategy()
+    return lambda: strat.signals(prices)
+
+def _bench_market_order(n):
+    def run():
+        b = Broker(cash=1e12)
+        for _ in range(n):
+            b.market_order("BUY", 1, 10.0)
+    return run
+
+def _bench_backtest(n):
+    prices = PriceLoader(seed=0).load(n, drift=0.0)  # keep prices bounded on long series
+    strat = VolatilityBreakoutStrategy()
+    def run():
+        b = Broker(cash=1e12)
+        b.position = n  # every SELL has inventory
+        Backtester(strat, b).run(prices)
+    return run
+
+CASES = {
+    "PriceLoader.load": _bench_load,
+    "VolatilityBreakoutStrategy.signals": _bench_signals,
+    "Broker.market_order": _bench_market_order,
+    "Backtester.run": _bench_backtest,
+}
+
+@pytest.mark.perf
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_scaling_within_budget(name):
+    budget = BUDGETS[name]
+    sizes = budget["sizes"]
+    times = [_best_time(CASES[name](n)) for n in sizes]
+    exponent = _scaling_exponent(sizes, times)
+    rates = ", ".join(f"n={n}: {n / t:,.0f}/s" for n, t in zip(sizes, times))
+    print(f"{name}: exponent={exponent:.2f} ({rates})")
+    assert exponent <= budget["max_exponent"], f"{name} scales as n^{exponent:.2f}"
+    # the exponent misses constant-factor slowdowns, so each size also has a throughput floor
+    for n, t, floor in zip(sizes, times, budget["min_rows_per_s"]):
+        assert n / t >= floor, f"{name} at n={n}: {n / t:,.0f}/s is below {floor:,}/s"
@@ -1,6 +1,7 @@
 # tests/test_strategy.py
 import pandas as pd
 import pytest
+from backtester.price_loader import PriceLoader
 from backtester.strategy import VolatilityBreakoutStrategy
 
 def test_signals_length(strategy, prices):
@@ -35,4 +36,18 @@ def test_strategy_invalid_lookback():
 def test_strategy_prices_not_series():
     strat = VolatilityBreakoutStrategy()
     with pytest.raises(TypeError, match="prices must be a pandas Series"):
-        strat.signals([100, 101, 102])
\ No newline at end of file
+        strat.signals([100, 101, 102])
+
+def test_streaming_update_matches_signals():
+    prices = PriceLoader(seed=4).load(10_000, vol=0.02)  # long enough to pass a resync
+    for lookback in (2, 20):
+        strat = VolatilityBreakoutStrategy(lookback=lookback)
+        streamed = [strat.update(p) for p in prices]
+        assert streamed == strat.signals(prices).tolist()
+
+def test_streaming_update_nan_and_reset():
+    strat = VolatilityBreakoutStrategy(lookback=3)
+    s = pd.Series([float('nan')] + list(range(1, 30)), dtype=float)
+    assert [strat.update(p) for p in s] == strat.signals(s).tolist()
+    strat.reset()
+    assert strat.update(100.0) == 0
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtester.broker import Broker
+from backtester.engine import Backtester
+from backtester.price_loader import PriceLoader
+from backtester.strategy import VolatilityBreakoutStrategy
+from backtester.sweep import sweep_lookbacks
+
+def test_sweep_signals_match_single_runs():
+    prices = PriceLoader(seed=11).load(600, vol=0.02)
+    lookbacks = [2, 3, 10, 25, 599, 700]
+    sigs = VolatilityBreakoutStrategy.sweep_signals(prices, lookbacks)
+    assert sigs.shape == (len(lookbacks), len(prices))
+    for row, lb in zip(sigs, lookbacks):
+        assert np.array_equal(row, VolatilityBreakoutStrategy(lookback=lb).signals(prices).to_numpy())
+
+def test_sweep_signals_invalid_lookback():
+    with pytest.raises(ValueError, match="lookback must be > 1"):
+        VolatilityBreakoutStrategy.sweep_signals(pd.Series([1.0, 2.0, 3.0]), [5, 1])
+
+def test_sweep_lookbacks_matches_backtester():
+    prices = PriceLoader(seed=12).load(500, vol=0.02)
+    res = sweep_lookbacks(prices, [5, 20], cash=50_000, qty=1, position=300)
+    assert list(res.index) == [5, 20]
+    for lb in res.index:
+        broker = Broker(cash=50_000)
+        broker.position = 300
+        eq = Backtester(VolatilityBreakoutStrategy(lookback=lb), broker).run(prices)
+        assert res.loc[lb, "final_equity"] == eq
+        assert res.loc[lb, "rejected"] == 0
@@ -1,6 +1,8 @@
 from __future__ import annotations
+from collections import Counter
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, Iterable
 from src.decorator import (
     Instrument,
     VolatilityDecorator,
@@ -14,3 +16,73 @@ def compute_all_metrics(inst: Instrument, market_df: pd.DataFrame, benchmark: st
         market_df,
     )
     return decorated.get_metrics()
+
+def price_matrix(market_df: pd.DataFrame) -> pd.DataFrame:
+    """timestamp x symbol prices (NaN where a symbol has no tick); last tick wins on duplicates."""
+    df = market_df.drop_duplicates(["timestamp", "symbol"], keep="last")
+    return df.pivot(index="timestamp", columns="symbol", values="price").sort_index()
+
+def _step_returns(p: np.ndarray) -> np.ndarray:
+    """Return from each column's previous non-NaN value; NaN where p is NaN."""
+    prev = pd.DataFrame(p).ffill().shift(1).to_numpy(dtype=float)
+    r = p / prev - 1.0
+    r[np.isnan(p)] = np.nan
+    return r
+
+def return_matrix(prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    Simple returns from each symbol's previous observation, placed at the
+    timestamp of the later one, so a column holds exactly the decorator returns.
+    """
+    return pd.DataFrame(_step_returns(prices.to_numpy(dtype=float)), index=prices.index, columns=prices.columns)
+
+def compute_universe_metrics(instruments: Iterable[Instrument], market_df: pd.DataFrame, benchmark: str) -> Dict[str, Dict]:
+    """
+    compute_all_metrics for a whole book in one pass: the data is pivoted once
+    and volatility, beta and max drawdown are column-wise array operations.
+    For beta, the symbol and the benchmark prices are both restricted to the
+    timestamps where each has a price before returns are taken, so every
+    return pair covers the same interval. Returns {symbol: metrics dict} with
+    the decorator keys; duplicate instrument symbols are rejected.
+    """
+    instruments = list(instruments)
+    symbols = [inst.symbol for inst in instruments]
+    dupes = sorted(sym for sym, k in Counter(symbols).items() if k > 1)
+    if dupes:
+        raise ValueError(f"duplicate instrument symbols: {dupes}")
+    prices = price_matrix(market_df)
+    prices = prices.reindex(columns=pd.Index(symbols).union([benchmark]))
+    returns = return_matrix(prices)
+
+    p = prices.to_numpy(dtype=float)
+    r = returns.to_numpy(dtype=float)
+    valid = ~np.isnan(r)
+    n = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(r, axis=0) / n
+        vol = np.sqrt(np.nansum((r - mean) ** 2, axis=0) / (n - 1))
+
+        pb = p[:, [prices.columns.get_loc(benchmark)]]
+        shared = ~np.isnan(p) & ~np.isnan(pb)
+        rs = _step_returns(np.where(shared, p, np.nan))
+        rb = _step_returns(np.where(shared, pb, np.nan))
+        both = ~np.isnan(rs)  # rb is defined on exactly the same cells
+        m = both.sum(axis=0)
+        rs, rb = np.where(both, rs, 0.0), np.where(both, rb, 0.0)
+        ds = np.where(both, rs - rs.sum(axis=0) / m, 0.0)
+        db = np.where(both, rb - rb.sum(axis=0) / m, 0.0)
+        beta = (ds * db).sum(axis=0) / (db * db).sum(axis=0)
+
+        peak = np.fmax.accumulate(p, axis=0)
+        mdd = np.nanmin((p - peak) / peak, axis=0)
+
+    col = {sym: i for i, sym in enumerate(returns.columns)}
+    out = {}
+    for inst in instruments:
+        j = col[inst.symbol]
+        metrics = inst.get_metrics()
+        metrics["volatility"] = float(vol[j])
+        metrics["beta"] = float(beta[j])
+        metrics["max_drawdown"] = float(mdd[j])
+        out[inst.symbol] = metrics
+    return out
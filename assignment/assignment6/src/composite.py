@@ -8,7 +8,14 @@ def load_json(path):
         data = json.load(f)
     return data
 
+# delta patches to a cached group value before it is recomputed from its children
+_RESYNC_EVERY = 4096
+
+
 class PortfolioComponent:
+    def __init__(self) -> None:
+        self._parent = None
+
     @abstractmethod
     def get_value(self):
         pass
@@ -17,12 +24,37 @@ class PortfolioComponent:
     def get_position(self):
         pass
 
+    def _propagate(self, delta: float) -> None:
+        """Apply a value change to every cached ancestor, O(depth)."""
+        if self._parent is not None:
+            self._parent._patch(delta)
+
 class Position(PortfolioComponent):
     def __init__(self, symbol, quantity, price) -> None:
         super().__init__()
         self.symbol = symbol
-        self.quantity = quantity
-        self.price = price
+        self._quantity = quantity
+        self._price = price
+
+    @property
+    def quantity(self):
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, value) -> None:
+        delta = (value - self._quantity) * self._price
+        self._quantity = value
+        self._propagate(delta)
+
+    @property
+    def price(self):
+        return self._price
+
+    @price.setter
+    def price(self, value) -> None:
+        delta = self._quantity * (value - self._price)
+        self._price = value
+        self._propagate(delta)
     
     def get_value(self) -> float:
         return self.quantity * self.price
@@ -34,20 +66,56 @@ class Position(PortfolioComponent):
         return f"Position({self.symbol}, qty={self.quantity}, price=${self.price:.2f})"
 
 class PortfolioGroup(PortfolioComponent):
+    """
+    Caches its aggregate value. Position price/quantity changes and bulk
+    reprices patch the cache of every ancestor with the value delta;
+    structural changes mark the group and its ancestors dirty so only those
+    subtrees are summed again. A component belongs to at most one group.
+    """
     def __init__(self, name: str) -> None:
         super().__init__()
         self.name = name
         self.children = list()
+        self._value = 0
+        self._dirty = False
+        self._updates = 0
+        self._by_symbol = None  # symbol -> [Position] over the subtree, built on demand
     
     def add(self, component: PortfolioComponent):
+        if component._parent is not None:
+            raise ValueError(f"{component!r} already belongs to {component._parent.name}")
         self.children.append(component) # position or sub_portfolio
+        component._parent = self
+        self._mark_dirty(structure=True)
+
+    def _patch(self, delta: float) -> None:
+        """Add `delta` to this group's cached value and its ancestors', stopping at a dirty one."""
+        node = self
+        while node is not None and not node._dirty:
+            node._value += delta
+            node._updates += 1
+            if node._updates >= _RESYNC_EVERY:
+                node._mark_dirty()
+                break
+            node = node._parent
+
+    def _mark_dirty(self, structure: bool = False) -> None:
+        node = self
+        while node is not None and (structure or not node._dirty):
+            node._dirty = True
+            if structure:
+                node._by_symbol = None
+            node = node._parent
     
     def get_value(self):
-        total = 0
-        for child in self.children:
-            total += child.get_value()
-        
-        return total
+        if self._dirty:
+            total = 0
+            for child in self.children:
+                total += child.get_value()
+            self._value = total
+            self._dirty = False
+            self._updates = 0
+        return self._value
 
     def get_positions(self) -> list:
         all_positions = list()
@@ -55,6 +123,39 @@ class PortfolioGroup(PortfolioComponent):
             all_positions.append(child.get_positions())
         
         return all_positions
+
+    def _symbol_index(self) -> dict:
+        if self._by_symbol is None:
+            index = {}
+            stack = [self]
+            while stack:
+                for child in stack.pop().children:
+                    if isinstance(child, PortfolioGroup):
+                        stack.append(child)
+                    else:
+                        index.setdefault(child.symbol, []).append(child)
+            self._by_symbol = index
+        return self._by_symbol
+
+    def reprice(self, prices) -> int:
+        """
+        Set new prices for every position in the subtree whose symbol is in
+        `prices` (a dict or pandas Series keyed by symbol). Returns the number
+        of positions updated. Value deltas are summed per parent group and sent
+        up each parent's chain once.
+        """
+        index = self._symbol_index()
+        deltas = {}
+        n = 0
+        for symbol, price in prices.items():
+            for pos in index.get(symbol, ()):
+                parent = pos._parent
+                deltas[parent] = deltas.get(parent, 0.0) + pos._quantity * (price - pos._price)
+                pos._price = price
+                n += 1
+        for group, delta in deltas.items():
+            group._patch(delta)
+        return n
     
     def __repr__(self):
         return f"PortfolioGroup({self.name}, value=${self.get_value():.2f})"
@@ -1,34 +1,230 @@
 from __future__ import annotations
 import json
 import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from src.patterns.strategy import MarketDataPoint
 
-class YahooFinanceAdapter:
+# JSON files above this size are parsed incrementally instead of with json.loads
+STREAM_THRESHOLD = 64 * 1024 * 1024
+
+Record = Tuple[str, Optional[datetime], float, Optional[float]]  # symbol, timestamp, price, volume
+
+
+@dataclass
+class MarketDataBatch:
+    """Columnar result of get_many: one entry per symbol found, in request order."""
+    symbols: List[str]
+    timestamps: List[datetime]
+    prices: np.ndarray
+    volumes: np.ndarray  # NaN where the vendor gave no volume
+    missing: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def points(self) -> List[MarketDataPoint]:
+        return [
+            MarketDataPoint(symbol=s, timestamp=ts, price=float(px), volume=None if v != v else float(v))
+            for s, ts, px, v in zip(self.symbols, self.timestamps, self.prices, self.volumes)
+        ]
+
+
+class _IndexedAdapter(ABC):
+    """
+    Loads the vendor file once, on first access, into a symbol -> row index
+    over compact columns, so lookups are O(1) and the parsed document is not kept.
+    Malformed records are skipped and listed in bad_records as (symbol, error).
+    """
+    keep_first = False  # which record wins when a symbol appears twice
+
     def __init__(self, path: str | Path):
-        self.data = json.loads(Path(path).read_text())
+        self.path = Path(path)
+        self._index: Optional[Dict[str, int]] = None
+        self.bad_records: List[Tuple[Optional[str], str]] = []
+
+    @abstractmethod
+    def _records(self) -> Iterator[Record]:
+        """Yield one Record per well-formed vendor record, reporting the rest with _reject."""
+
+    def _reject(self, symbol: Optional[str], error: Exception | str) -> None:
+        self.bad_records.append((symbol, str(error) if isinstance(error, str) else f"{type(error).__name__}: {error}"))
+
+    def _default_ts(self) -> datetime:
+        raise KeyError("record has no timestamp")
+
+    def _ensure_index(self) -> Dict[str, int]:
+        if self._index is None:
+            self.bad_records = []
+            index: Dict[str, int] = {}
+            ts, px, vol = [], [], []
+            for symbol, t, p, v in self._records():
+                row = index.get(symbol)
+                if row is None:
+                    index[symbol] = len(px)
+                    ts.append(t)
+                    px.append(p)
+                    vol.append(v)
+                elif not self.keep_first:
+                    ts[row], px[row], vol[row] = t, p, v
+            self._ts, self._px, self._vol = ts, px, vol
+            self._index = index
+        return self._index
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._ensure_index())
+
+    def _timestamp(self, row: int) -> datetime:
+        t = self._ts[row]
+        return t if t is not None else self._default_ts()
 
     def get_data(self, symbol: str) -> Optional[MarketDataPoint]:
-        node = self.data.get(symbol)
-        if not node:
+        row = self._ensure_index().get(symbol)
+        if row is None:
             return None
-        ts = datetime.fromisoformat(node["ts"])
-        return MarketDataPoint(symbol=symbol, timestamp=ts, price=float(node["price"]), volume=node.get("volume"))
+        return MarketDataPoint(symbol=symbol, timestamp=self._timestamp(row), price=self._px[row], volume=self._vol[row])
 
-class BloombergXMLAdapter:
-    def __init__(self, path: str | Path):
-        self.root = ET.fromstring(Path(path).read_text())
+    def get_many(self, symbols: Iterable[str]) -> MarketDataBatch:
+        index = self._ensure_index()
+        found, rows, missing = [], [], []
+        for s in symbols:
+            row = index.get(s)
+            if row is None:
+                missing.append(s)
+            else:
+                found.append(s)
+                rows.append(row)
+        px, vol = self._px, self._vol
+        return MarketDataBatch(
+            symbols=found,
+            timestamps=[self._timestamp(r) for r in rows],
+            prices=np.fromiter((px[r] for r in rows), dtype=float, count=len(rows)),
+            volumes=np.fromiter((np.nan if vol[r] is None else vol[r] for r in rows), dtype=float, count=len(rows)),
+            missing=missing,
+        )
 
-    def get_data(self, symbol: str) -> Optional[MarketDataPoint]:
-        for security in self.root.findall(".//security"):
-            if security.attrib.get("symbol") == symbol:
-                px = float(security.findtext("./field[@name='PX_LAST']"))
-                vol_text = security.findtext("./field[@name='VOLUME']")
-                ts_text = security.findtext("./field[@name='TIME']")
-                vol = float(vol_text) if vol_text is not None else None
-                ts = datetime.fromisoformat(ts_text) if ts_text else datetime.utcnow()
-                return MarketDataPoint(symbol=symbol, timestamp=ts, price=px, volume=vol)
-        return None
+
+def iter_json_object(path: str | Path, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, object]]:
+    """Yield (key, value) pairs of a top-level JSON object, reading `chunk_size` characters at a time."""
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+
+        def more() -> None:
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buf = buf[pos:] + chunk
+            pos = 0
+
+        def next_char() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos].isspace():
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if eof:
+                    raise ValueError(f"{path}: unexpected end of JSON")
+                more()
+
+        def decode():
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    if end < len(buf) or eof:  # a value ending at the buffer edge may be cut short
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                more()
+
+        if next_char() != "{":
+            raise ValueError(f"{path}: expected a JSON object")
+        pos += 1
+        if next_char() == "}":
+            return
+        while True:
+            next_char()
+            key = decode()
+            if next_char() != ":":
+                raise ValueError(f"{path}: expected ':' after {key!r}")
+            pos += 1
+            next_char()
+            yield key, decode()
+            c = next_char()
+            pos += 1
+            if c == "}":
+                return
+            if c != ",":
+                raise ValueError(f"{path}: expected ',' or '}}' after {key!r}")
+
+
+class YahooFinanceAdapter(_IndexedAdapter):
+    """
+    {symbol: {"ts", "price", "volume"}} JSON. Files larger than STREAM_THRESHOLD
+    (or stream=True) are decoded incrementally rather than read whole.
+    """
+    def __init__(self, path: str | Path, stream: Optional[bool] = None):
+        super().__init__(path)
+        self.stream = self.path.stat().st_size > STREAM_THRESHOLD if stream is None else stream
+
+    def _records(self) -> Iterator[Record]:
+        items = iter_json_object(self.path) if self.stream else json.loads(self.path.read_text()).items()
+        for symbol, node in items:
+            if not node:
+                continue
+            try:
+                vol = node.get("volume")
+                record = (symbol, datetime.fromisoformat(node["ts"]), float(node["price"]),
+                          None if vol is None else float(vol))
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                self._reject(symbol, e)
+                continue
+            yield record
+
+
+class BloombergXMLAdapter(_IndexedAdapter):
+    """<security symbol=...><field name="PX_LAST|VOLUME|TIME"> XML, parsed with iterparse."""
+    keep_first = True
+
+    def _default_ts(self) -> datetime:
+        return datetime.utcnow()
+
+    def _records(self) -> Iterator[Record]:
+        open_elems = []  # ancestors of the current element
+        for event, elem in ET.iterparse(self.path, events=("start", "end")):
+            if event == "start":
+                open_elems.append(elem)
+                continue
+            open_elems.pop()
+            if elem.tag != "security":
+                continue
+            symbol = elem.attrib.get("symbol")
+            px_text = elem.findtext("./field[@name='PX_LAST']")
+            vol_text = elem.findtext("./field[@name='VOLUME']")
+            ts_text = elem.findtext("./field[@name='TIME']") or None
+            # drop the parsed subtree and detach it, so neither it nor its parent grows with the file
+            elem.clear()
+            if open_elems:
+                open_elems[-1].remove(elem)
+            if symbol is None or px_text is None:
+                self._reject(symbol, "missing symbol or PX_LAST")
+                continue
+            try:
+                record = (symbol, datetime.fromisoformat(ts_text) if ts_text else None, float(px_text),
+                          float(vol_text) if vol_text is not None else None)
+            except ValueError as e:
+                self._reject(symbol, e)
+                continue
+            yield record
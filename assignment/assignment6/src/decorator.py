@@ -1,7 +1,69 @@
 # decorator.py
+import weakref
+
 import numpy as np
 import pandas as pd
 
+
+class MarketDataIndex:
+    """
+    Immutable view of long-format market data (symbol, timestamp, price) sorted
+    once by (symbol, timestamp), with per-symbol row ranges. Price histories are
+    O(1) slices and returns are computed once per symbol.
+    """
+    def __init__(self, market_data: pd.DataFrame) -> None:
+        df = market_data.sort_values(["symbol", "timestamp"], kind="mergesort")
+        symbols = df["symbol"].to_numpy()
+        self.prices = df["price"]
+        self.version = data_version(market_data)
+        self.n_rows = len(market_data)
+
+        starts = np.flatnonzero(np.r_[True, symbols[1:] != symbols[:-1]]) if len(df) else np.array([], dtype=int)
+        stops = np.r_[starts[1:], len(df)]
+        self._ranges = {symbols[a]: (int(a), int(b)) for a, b in zip(starts, stops)}
+        self._returns = {}
+
+    @property
+    def symbols(self):
+        return list(self._ranges)
+
+    def price_history(self, symbol) -> pd.Series:
+        start, stop = self._ranges.get(symbol, (0, 0))
+        return self.prices.iloc[start:stop]
+
+    def returns(self, symbol) -> pd.Series:
+        r = self._returns.get(symbol)
+        if r is None:
+            r = self._returns[symbol] = self.price_history(symbol).pct_change().dropna()
+        return r
+
+
+def data_version(market_data: pd.DataFrame) -> int:
+    return market_data.attrs.get("data_version", 0)
+
+
+def bump_data_version(market_data: pd.DataFrame) -> None:
+    """Call after modifying a frame in place so cached indexes are rebuilt."""
+    market_data.attrs["data_version"] = data_version(market_data) + 1
+
+
+_INDEX_CACHE = {}  # id(frame) -> (weakref to frame, index)
+
+
+def market_index(market_data) -> MarketDataIndex:
+    """Shared MarketDataIndex for a frame, rebuilt when its data_version (or length) changes."""
+    if isinstance(market_data, MarketDataIndex):
+        return market_data
+    key = id(market_data)
+    entry = _INDEX_CACHE.get(key)
+    if entry is not None:
+        ref, index = entry
+        if ref() is market_data and index.version == data_version(market_data) and index.n_rows == len(market_data):
+            return index
+    index = MarketDataIndex(market_data)
+    _INDEX_CACHE[key] = (weakref.ref(market_data, lambda _, key=key: _INDEX_CACHE.pop(key, None)), index)
+    return index
+
 class Instrument:
     """
     Base class
@@ -46,17 +108,18 @@ class VolatilityDecorator(InstrumentDecorator):
         
         # Volatility
         symbol = self._instrument.symbol
-        prices = self._get_price_history(symbol)
-        metrics["volatility"] = self._calculate_vol(prices)
+        returns = market_index(self.market_data).returns(symbol)
+        metrics["volatility"] = self._vol_from_returns(returns)
         return metrics
         
     def _get_price_history(self, symbol):
-        history = self.market_data[self.market_data["symbol"] == symbol]
-        history = history.sort_values('timestamp')
-        return history["price"] # Pandas Series
+        return market_index(self.market_data).price_history(symbol) # Pandas Series
 
     def _calculate_vol(self, prices):
         returns = prices.pct_change().dropna()
+        return self._vol_from_returns(returns)
+
+    def _vol_from_returns(self, returns):
         std = returns.std()
         return float(std)
 
@@ -76,13 +139,10 @@ class BetaDecorator(InstrumentDecorator):
         return metrics
 
     def _get_returns(self, symbol):
-        prices = self._get_price_history(symbol)
-        return prices.pct_change().dropna()
+        return market_index(self.market_data).returns(symbol)
     
     def _get_price_history(self, symbol):
-        history = self.market_data[self.market_data["symbol"] == symbol]
-        history = history.sort_values('timestamp')
-        return history["price"] # Pandas Series
+        return market_index(self.market_data).price_history(symbol) # Pandas Series
     
     def _calculate_beta(self, stock_returns, market_returns):
         
@@ -114,9 +174,7 @@ class DrawdownDecorator(InstrumentDecorator):
         return metrics
         
     def _get_price_history(self, symbol):
-        history = self.market_data[self.market_data["symbol"] == symbol]
-        history = history.sort_values('timestamp')
-        return history["price"] # Pandas Series
+        return market_index(self.market_data).price_history(symbol) # Pandas Series
 
     def _calculate_drawdown(self, prices):
         cumulative_max = prices.cummax()
@@ -1,32 +1,228 @@
 from __future__ import annotations
 import csv
+import heapq
+import os
+import pickle
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Dict
+from typing import Iterable, List, Dict, Optional
 
-from src.patterns.strategy import MarketDataPoint, MeanReversionStrategy, BreakoutStrategy, SignalPublisher
-from src.patterns.command import ExecutionContext, ExecuteOrderCommand, CommandInvoker
+from src.patterns.strategy import MarketDataPoint, MeanReversionStrategy, BreakoutStrategy, Signal
+from src.patterns.observer import SignalPublisher
+from src.patterns.command import (ExecutionContext, ExecuteOrderCommand, BatchOrderCommand, CommandInvoker,
+                                  CommandJournal)
+
+def row_to_tick(row, symbol_col="symbol", ts_col="timestamp", px_col="price", vol_col="volume") -> MarketDataPoint:
+    """One CSV row (a dict of column -> text) as a MarketDataPoint."""
+    return MarketDataPoint(
+        symbol=row[symbol_col],
+        timestamp=datetime.fromisoformat(row[ts_col]),
+        price=float(row[px_col]),
+        volume=float(row[vol_col]) if row.get(vol_col) else None,
+    )
 
 def load_ticks_csv(path: str | Path, symbol_col="symbol", ts_col="timestamp", px_col="price", vol_col="volume") -> Iterable[MarketDataPoint]:
     with open(path, newline="") as f:
         for row in csv.DictReader(f):
-            yield MarketDataPoint(
-                symbol=row[symbol_col],
-                timestamp=datetime.fromisoformat(row[ts_col]),
-                price=float(row[px_col]),
-                volume=float(row[vol_col]) if row.get(vol_col) else None,
-            )
-
-def run_engine(market_csv: str | Path, strategies=None, publisher: SignalPublisher | None = None):
-    strategies = strategies or [MeanReversionStrategy(window=5, k=1.0, qty=10), BreakoutStrategy(lookback=3, qty=5)]
+            yield row_to_tick(row, symbol_col, ts_col, px_col, vol_col)
+
+def _iter_rows_from(path: str | Path, offset: int = 0):
+    """
+    Yield (end byte offset, row dict) for each data row, starting at byte
+    `offset` (0 = first data row). A single csv.reader reads the file; the
+    offset counts the raw lines it has consumed.
+    """
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode()]))
+        if offset:
+            f.seek(offset)
+        pos = f.tell()
+
+        def lines():
+            nonlocal pos
+            for raw in f:
+                pos += len(raw)
+                yield raw.decode()
+
+        for row in csv.reader(lines()):
+            if row:
+                yield pos, dict(zip(header, row))
+
+CHECKPOINT_VERSION = 2
+
+def save_checkpoint(path: str | Path, state: dict) -> None:
+    """Write a compressed pickle atomically (tmp file + rename), so a crash never leaves a torn checkpoint."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 1))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def load_checkpoint(path: str | Path) -> dict:
+    state = pickle.loads(zlib.decompress(Path(path).read_bytes()))
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"unsupported checkpoint version: {state.get('version')}")
+    return state
+
+def default_strategies():
+    """The strategy set run_engine and run_live use when none are given."""
+    return [MeanReversionStrategy(window=5, k=1.0, qty=10), BreakoutStrategy(lookback=3, qty=5)]
+
+def symbol_shard(symbol: str, n_shards: int) -> int:
+    # stable across processes, unlike hash()
+    return zlib.crc32(symbol.encode()) % n_shards
+
+def _split_by_shard(market_csv, n_shards: int, out_dir: Path):
+    """
+    One pass over the input that writes each shard's rows, prefixed with their
+    row number, to its own file, so every worker parses only its own symbols.
+    Returns the input header and the shard file paths.
+    """
+    paths = [out_dir / f"shard{i}.csv" for i in range(n_shards)]
+    with open(market_csv, newline="") as f, ExitStack() as stack:
+        reader = csv.reader(f)
+        header = next(reader)
+        sym_col = header.index("symbol")
+        writers = [csv.writer(stack.enter_context(open(p, "w", newline=""))).writerow for p in paths]
+        shard_of: Dict[str, int] = {}
+        row_idx = 0
+        for row in reader:
+            if not row:
+                continue
+            sym = row[sym_col]
+            s = shard_of.get(sym)
+            if s is None:
+                s = shard_of[sym] = symbol_shard(sym, n_shards)
+            writers[s]([row_idx, *row])
+            row_idx += 1
+    return header, paths
+
+def _run_shard(shard_csv, header: List[str], strategies):
+    """
+    Worker: run the strategies over one shard file. Orders are applied straight
+    to a context with no trade log or undo history; returns every signal keyed
+    by (row, strategy index, signal index), the shard's positions and its net
+    cash flow.
+    """
+    strategies = strategies or default_strategies()
+    ctx = ExecutionContext(cash=0.0, record_trades=False)
+    sym_col, ts_col, px_col = (header.index(c) + 1 for c in ("symbol", "timestamp", "price"))
+    vol_col = header.index("volume") + 1 if "volume" in header else None
+    keyed = []
+    with open(shard_csv, newline="") as f:
+        for row in csv.reader(f):
+            vol = row[vol_col] if vol_col is not None else None
+            tick = MarketDataPoint(symbol=row[sym_col], timestamp=datetime.fromisoformat(row[ts_col]),
+                                   price=float(row[px_col]), volume=float(vol) if vol else None)
+            row_idx = int(row[0])
+            for strat_idx, strat in enumerate(strategies):
+                for sig_idx, sig in enumerate(strat.generate_signals(tick)):
+                    if type(sig) is not Signal:
+                        sig = Signal.from_mapping(sig)
+                    keyed.append(((row_idx, strat_idx, sig_idx), sig))
+                    if sig.type == "ORDER":
+                        ExecuteOrderCommand(ctx, sig).execute()
+    return keyed, ctx.positions, ctx.cash
+
+def _run_sharded(market_csv, strategies, pub: SignalPublisher, workers: int, record_trades: bool) -> ExecutionContext:
+    with tempfile.TemporaryDirectory() as tmp:
+        header, paths = _split_by_shard(market_csv, workers, Path(tmp))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_shard, str(p), header, strategies) for p in paths]
+            shards = [fut.result() for fut in futures]
+
+    ctx = ExecutionContext(cash=100_000.0, record_trades=record_trades)
+    for _, positions, cash in shards:
+        ctx.positions.update(positions)  # symbols are disjoint across shards
+        ctx.cash += cash
+
+    # signals are merged in file order, so observers and the trade log see the single-process sequence
+    for _, sig in heapq.merge(*(keyed for keyed, _, _ in shards), key=lambda item: item[0]):
+        pub.notify(sig)
+        if record_trades and sig.type == "ORDER":
+            ctx.trades.append(("EXECUTE", sig))
+    return ctx
+
+def process_tick(tick: MarketDataPoint, strategies, pub: SignalPublisher, inv: CommandInvoker, ctx: ExecutionContext) -> None:
+    """Run every strategy on one tick; its orders execute together as one command."""
+    orders = []
+    for strat in strategies:
+        for sig in strat.generate_signals(tick):
+            if type(sig) is not Signal:
+                sig = Signal.from_mapping(sig)
+            pub.notify(sig)
+            if sig.type == "ORDER":
+                orders.append(sig)
+    if len(orders) == 1:  # a batch only pays off from two orders up
+        inv.execute(ExecuteOrderCommand(ctx, orders[0]))
+    elif orders:
+        inv.execute(BatchOrderCommand(ctx, orders))
+
+def run_engine(market_csv: str | Path, strategies=None, publisher: SignalPublisher | None = None, workers: int = 1,
+               checkpoint_path: str | Path | None = None, checkpoint_every: int = 10_000,
+               resume_from: str | Path | None = None, max_undo: Optional[int] = 1_000,
+               journal: Optional[CommandJournal] = None, record_trades: bool = True):
+    """
+    workers > 1 splits the input by symbol into one file per process (each
+    with its own strategy copies and ExecutionContext shard) and merges the
+    shards into one file-ordered trade log and final context. Cash is the sum
+    of the shards' net flows, so it can differ from a single-process run in
+    the last bits. Observers are notified after the shards finish, in the same
+    order as a single-process run. The workers run on copies of `strategies`:
+    the caller's strategy objects are left untouched.
+
+    checkpoint_path saves strategy state, cash, positions and the input byte
+    offset every `checkpoint_every` rows (and at the end). resume_from loads
+    such a checkpoint, checks it was taken on the same `market_csv` and seeks
+    straight to the first unconsumed row; the strategies stored in the
+    checkpoint replace `strategies`. Neither the trade log nor undo history is
+    checkpointed, so a resumed context only lists the trades made after the
+    resume point; pass a journal for the complete record.
+
+    max_undo bounds the invoker's in-memory undo history (None = unbounded),
+    journal records every executed command on disk, and record_trades=False
+    skips the in-memory trade log (use it with a journal on long runs).
+    """
     pub = publisher or SignalPublisher()
-    ctx = ExecutionContext(cash=100_000.0)
-    inv = CommandInvoker()
-
-    for tick in load_ticks_csv(market_csv):
-        for strat in strategies:
-            for sig in strat.generate_signals(tick):
-                pub.notify(sig)
-                if sig.get("type") == "ORDER":
-                    inv.execute(ExecuteOrderCommand(ctx, sig))
-    return ctx  
+    if workers > 1:
+        if checkpoint_path or resume_from or journal is not None:
+            raise ValueError("checkpointing and journaling are only supported with workers=1")
+        return _run_sharded(market_csv, strategies, pub, workers, record_trades)
+
+    source = str(Path(market_csv).resolve())
+    offset, rows = 0, 0
+    if resume_from is not None:
+        state = load_checkpoint(resume_from)
+        if state["market_csv"] != source:
+            raise ValueError(f"checkpoint was taken on {state['market_csv']}, not {source}")
+        strategies, offset, rows = state["strategies"], state["offset"], state["rows"]
+        ctx = ExecutionContext(cash=state["cash"], positions=state["positions"], record_trades=record_trades)
+    else:
+        strategies = strategies or default_strategies()
+        ctx = ExecutionContext(cash=100_000.0, record_trades=record_trades)
+    inv = CommandInvoker(max_undo=max_undo, journal=journal)
+
+    if checkpoint_path is None and resume_from is None:
+        for tick in load_ticks_csv(market_csv):
+            process_tick(tick, strategies, pub, inv, ctx)
+        return ctx
+
+    def checkpoint():
+        save_checkpoint(checkpoint_path, {"version": CHECKPOINT_VERSION, "market_csv": source, "offset": offset,
+                                          "rows": rows, "strategies": strategies, "cash": ctx.cash,
+                                          "positions": ctx.positions})
+
+    for offset, row in _iter_rows_from(market_csv, offset):
+        process_tick(row_to_tick(row), strategies, pub, inv, ctx)
+        rows += 1
+        if checkpoint_path is not None and rows % checkpoint_every == 0:
+            checkpoint()
+    if checkpoint_path is not None:
+        checkpoint()
+    return ctx
@@ -0,0 +1,335 @@
+# indicators.py
+from __future__ import annotations
+
+import heapq
+import operator
+from collections import defaultdict, deque
+from math import floor, fsum, sqrt
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# updates between exact recomputes of incrementally maintained sums (>= 16 windows)
+RESYNC_EVERY = 4096
+
+
+def resync_interval(window: int) -> int:
+    return max(RESYNC_EVERY, 16 * int(window))
+
+
+class RollingStats:
+    """
+    Fixed-window rolling mean/variance (sliding Welford with exact removal).
+    Every `resync_every` updates the moments are recomputed from the window
+    to bound floating-point drift.
+    """
+    def __init__(self, window: int, resync_every: Optional[int] = None):
+        if int(window) < 1:
+            raise ValueError("window must be >= 1")
+        self.window = int(window)
+        self.resync_every = int(resync_every or resync_interval(self.window))
+        self.q: Deque[float] = deque(maxlen=self.window)
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._since_sync = 0
+
+    def add(self, x: float) -> None:
+        x = float(x)
+        q = self.q
+        if len(q) == self.window:
+            old = q[0]
+            q.append(x)
+            old_mean = self._mean
+            self._mean = old_mean + (x - old) / self.window
+            self._m2 += (x - old) * (x - self._mean + old - old_mean)
+        else:
+            q.append(x)
+            delta = x - self._mean
+            self._mean += delta / len(q)
+            self._m2 += delta * (x - self._mean)
+
+        self._since_sync += 1
+        if self._since_sync >= self.resync_every:
+            self.resync()
+
+    def resync(self) -> None:
+        """Recompute mean and M2 exactly from the current window."""
+        n = len(self.q)
+        self._since_sync = 0
+        if not n:
+            self._mean = self._m2 = 0.0
+            return
+        mean = fsum(self.q) / n
+        self._mean = mean
+        self._m2 = fsum((v - mean) * (v - mean) for v in self.q)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.q) == self.window
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self.q else 0.0
+
+    @property
+    def var(self) -> float:
+        """Population variance of the window."""
+        n = len(self.q)
+        if n <= 1:
+            return 0.0
+        return max(self._m2 / n, 0.0)
+
+    @property
+    def std(self) -> float:
+        return sqrt(self.var)
+
+
+class _MonotonicWindow:
+    """
+    Monotonic deque of (index, value); the front is the window extreme.
+    `dominates(new, old)` is true when `new` makes `old` irrelevant
+    (operator.ge for a maximum, operator.le for a minimum).
+    """
+    def __init__(self, window: int, dominates: Callable[[float, float], bool]):
+        if int(window) < 1:
+            raise ValueError("window must be >= 1")
+        self.window = int(window)
+        self._dominates = dominates
+        self._dq: Deque[Tuple[int, float]] = deque()
+        self._n = 0
+
+    def add(self, x: float) -> None:
+        x = float(x)
+        dq = self._dq
+        while dq and self._dominates(x, dq[-1][1]):
+            dq.pop()
+        dq.append((self._n, x))
+        self._n += 1
+        if dq[0][0] <= self._n - 1 - self.window:
+            dq.popleft()
+
+    @property
+    def ready(self) -> bool:
+        return self._n >= self.window
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._dq[0][1] if self._dq else None
+
+
+class RollingMax(_MonotonicWindow):
+    """Rolling maximum over the last `window` values, O(1) amortized."""
+    def __init__(self, window: int):
+        super().__init__(window, operator.ge)
+
+
+class RollingMin(_MonotonicWindow):
+    """Rolling minimum over the last `window` values, O(1) amortized."""
+    def __init__(self, window: int):
+        super().__init__(window, operator.le)
+
+
+class EWMA:
+    """Exponentially weighted moving average; give either `alpha` or `span`."""
+    def __init__(self, alpha: Optional[float] = None, span: Optional[float] = None):
+        if alpha is None:
+            if span is None or span < 1:
+                raise ValueError("need alpha in (0, 1] or span >= 1")
+            alpha = 2.0 / (span + 1.0)
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = float(alpha)
+        self._value: Optional[float] = None
+        self.count = 0
+
+    def add(self, x: float) -> None:
+        x = float(x)
+        if self._value is None:
+            self._value = x
+        else:
+            self._value += self.alpha * (x - self._value)
+        self.count += 1
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not None
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._value
+
+
+class Momentum:
+    """x_t - x_{t-window} (and the matching simple return)."""
+    def __init__(self, window: int):
+        if int(window) < 1:
+            raise ValueError("window must be >= 1")
+        self.window = int(window)
+        self.q: Deque[float] = deque(maxlen=self.window + 1)
+
+    def add(self, x: float) -> None:
+        self.q.append(float(x))
+
+    @property
+    def ready(self) -> bool:
+        return len(self.q) == self.window + 1
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self.ready:
+            return None
+        return self.q[-1] - self.q[0]
+
+    @property
+    def ret(self) -> Optional[float]:
+        if not self.ready or self.q[0] == 0.0:
+            return None
+        return self.q[-1] / self.q[0] - 1.0
+
+
+class RollingQuantile:
+    """
+    Sliding-window quantile (linear interpolation, same as pandas/numpy default)
+    using two heaps with lazy deletion, O(log w) amortized per update.
+    `low` holds the smallest floor(q*(n-1))+1 values, `high` the rest. NaN
+    counts as missing, as in pandas: it takes a window slot but is left out
+    of the quantile (`count` is the number of valid values in the window).
+    """
+    def __init__(self, window: int, q: float = 0.5):
+        if int(window) < 1:
+            raise ValueError("window must be >= 1")
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be in [0, 1]")
+        self.window = int(window)
+        self.q = float(q)
+        self.buf: Deque[float] = deque(maxlen=self.window)
+        self._low: List[float] = []   # max-heap via negated values
+        self._high: List[float] = []  # min-heap
+        self._low_size = 0
+        self._high_size = 0
+        self._delayed: Dict[float, int] = defaultdict(int)
+        self._missing = 0  # NaNs in buf
+
+    @property
+    def count(self) -> int:
+        return len(self.buf) - self._missing
+
+    def add(self, x: float) -> None:
+        x = float(x)
+        if len(self.buf) == self.window:
+            old = self.buf[0]
+            if old != old:
+                self._missing -= 1
+            else:
+                self._remove(old)
+        self.buf.append(x)
+        if x != x:
+            self._missing += 1
+            self._rebalance()
+            return
+
+        if self._high_size and x >= self._high[0]:
+            heapq.heappush(self._high, x)
+            self._high_size += 1
+        else:
+            heapq.heappush(self._low, -x)
+            self._low_size += 1
+        self._rebalance()
+
+        # lazily deleted entries can pile up inside the heaps; compact occasionally
+        if len(self._low) + len(self._high) > 2 * self.window + 16:
+            self._rebuild()
+
+    def _remove(self, x: float) -> None:
+        self._delayed[x] += 1
+        if x <= -self._low[0]:
+            self._low_size -= 1
+            if x == -self._low[0]:
+                self._prune_low()
+        else:
+            self._high_size -= 1
+            if x == self._high[0]:
+                self._prune_high()
+
+    def _prune_low(self) -> None:
+        low, delayed = self._low, self._delayed
+        while low and delayed.get(-low[0]):
+            v = -heapq.heappop(low)
+            delayed[v] -= 1
+            if not delayed[v]:
+                del delayed[v]
+
+    def _prune_high(self) -> None:
+        high, delayed = self._high, self._delayed
+        while high and delayed.get(high[0]):
+            v = heapq.heappop(high)
+            delayed[v] -= 1
+            if not delayed[v]:
+                del delayed[v]
+
+    def _rebalance(self) -> None:
+        k = floor(self.q * (self.count - 1)) + 1 if self.count else 0
+        while self._low_size > k:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune_low()
+        while self._low_size < k:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune_high()
+
+    def _rebuild(self) -> None:
+        vals = sorted(v for v in self.buf if v == v)
+        k = floor(self.q * (len(vals) - 1)) + 1 if vals else 0
+        self._low = [-v for v in reversed(vals[:k])]
+        self._high = vals[k:]  # sorted list is already a valid heap
+        self._low_size, self._high_size = len(self._low), len(self._high)
+        self._delayed.clear()
+
+    @property
+    def ready(self) -> bool:
+        return len(self.buf) == self.window
+
+    @property
+    def value(self) -> Optional[float]:
+        n = self.count
+        if not n:
+            return None
+        h = self.q * (n - 1)
+        frac = h - floor(h)
+        lo = -self._low[0]
+        if frac == 0.0 or not self._high_size:
+            return lo
+        return lo + frac * (self._high[0] - lo)
+
+
+class RollingMedian(RollingQuantile):
+    def __init__(self, window: int):
+        super().__init__(window, q=0.5)
+
+
+def rolling_quantile(values, window: int, q: float = 0.5, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Batch mode over a 1-D series or a 2-D (time x assets) panel, column by column.
+    Matches pandas rolling(window, min_periods).quantile(q): NaNs are skipped,
+    and a row is NaN until its window holds min_periods (default: window) valid values.
+    """
+    arr = np.asarray(values, dtype=float)
+    if arr.ndim not in (1, 2):
+        raise ValueError("values must be 1-D or 2-D")
+    min_periods = int(window) if min_periods is None else int(min_periods)
+    if not 1 <= min_periods <= int(window):
+        raise ValueError("min_periods must be in [1, window]")
+    cols = arr.reshape(len(arr), -1)
+    out = np.full(cols.shape, np.nan)
+    for j in range(cols.shape[1]):
+        rq = RollingQuantile(window, q)
+        col = out[:, j]
+        for i, x in enumerate(cols[:, j].tolist()):
+            rq.add(x)
+            if rq.count >= min_periods:
+                col[i] = rq.value
+    return out.reshape(arr.shape)
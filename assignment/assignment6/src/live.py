@@ -0,0 +1,186 @@
+from __future__ import annotations
+import asyncio
+import csv
+import heapq
+from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Optional, Sequence
+
+from src.engine import default_strategies, row_to_tick, load_ticks_csv, process_tick
+from src.patterns.strategy import MarketDataPoint
+from src.patterns.observer import SignalPublisher
+from src.patterns.command import ExecutionContext, CommandInvoker, CommandJournal
+
+_DONE = object()
+
+# ---- tick sources -------------------------------------------------------------
+
+async def iter_source(ticks: Iterable[MarketDataPoint], interval: float = 0.0) -> AsyncIterator[MarketDataPoint]:
+    """Replay an in-memory or file-backed tick iterable, optionally paced."""
+    for tick in ticks:
+        yield tick
+        await asyncio.sleep(interval)
+
+def csv_source(path: str | Path, interval: float = 0.0) -> AsyncIterator[MarketDataPoint]:
+    return iter_source(load_ticks_csv(path), interval)
+
+async def adapter_source(adapter, symbols: Sequence[str], interval: float = 1.0,
+                         polls: Optional[int] = None) -> AsyncIterator[MarketDataPoint]:
+    """Poll a vendor adapter's get_many every `interval` seconds (file access runs in a thread)."""
+    n = 0
+    while polls is None or n < polls:
+        batch = await asyncio.to_thread(adapter.get_many, symbols)
+        for point in sorted(batch.points(), key=lambda p: p.timestamp):
+            yield point
+        n += 1
+        if polls is None or n < polls:
+            await asyncio.sleep(interval)
+
+class _LineFeed:
+    """Hands one pushed line at a time to a long-lived csv.reader."""
+    def __init__(self):
+        self.line = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line, self.line = self.line, None
+        if line is None:
+            raise StopIteration
+        return line
+
+async def socket_source(host: str, port: int) -> AsyncIterator[MarketDataPoint]:
+    """Ticks as CSV lines (header first, one record per line) over TCP, until the server closes."""
+    reader, writer = await asyncio.open_connection(host, port)
+    feed = _LineFeed()
+    rows = csv.reader(feed)
+    try:
+        feed.line = (await reader.readline()).decode()
+        header = next(rows)
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                feed.line = line.decode()
+                yield row_to_tick(dict(zip(header, next(rows))))
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+class SimulatedFeedServer:
+    """
+    Local stand-in for a vendor feed: streams `ticks` as CSV lines to every
+    client that connects, `interval` seconds apart, then closes the connection.
+    port=0 picks a free port (read it from .port after start()).
+    """
+    def __init__(self, ticks: Iterable[MarketDataPoint], host: str = "127.0.0.1", port: int = 0,
+                 interval: float = 0.0):
+        self.ticks = list(ticks)
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def _serve(self, reader, writer) -> None:
+        try:
+            writer.write(b"timestamp,symbol,price,volume\n")
+            for t in self.ticks:
+                vol = "" if t.volume is None else t.volume
+                writer.write(f"{t.timestamp.isoformat()},{t.symbol},{t.price!r},{vol}\n".encode())
+                await writer.drain()  # the client's read pace throttles us
+                if self.interval:
+                    await asyncio.sleep(self.interval)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> "SimulatedFeedServer":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+# ---- engine -------------------------------------------------------------------
+
+async def _pump(source: AsyncIterator[MarketDataPoint], queue: asyncio.Queue) -> None:
+    async for tick in source:
+        await queue.put(tick)  # waits while the queue is full
+    await queue.put(_DONE)
+
+async def _merge(queues: List[asyncio.Queue], strategies, pub: SignalPublisher, inv: CommandInvoker,
+                 ctx: ExecutionContext) -> None:
+    heads = []
+    seq = 0
+    for i, q in enumerate(queues):
+        tick = await q.get()
+        if tick is not _DONE:
+            heads.append((tick.timestamp, i, seq, tick))
+            seq += 1
+    heapq.heapify(heads)
+
+    while heads:
+        _, i, _, tick = heapq.heappop(heads)
+        process_tick(tick, strategies, pub, inv, ctx)
+        nxt = await queues[i].get()
+        if nxt is not _DONE:
+            heapq.heappush(heads, (nxt.timestamp, i, seq, nxt))
+            seq += 1
+
+async def run_live(sources: Sequence[AsyncIterator[MarketDataPoint]], strategies=None,
+                   publisher: SignalPublisher | None = None, ctx: ExecutionContext | None = None,
+                   max_queue: int = 1024, max_undo: Optional[int] = 1_000,
+                   journal: Optional[CommandJournal] = None, record_trades: bool = True) -> ExecutionContext:
+    """
+    Consume several async tick sources concurrently and feed them, merged in
+    timestamp order, through the strategies, publisher and a CommandInvoker
+    (same loop as run_engine). Each source must be time-ordered itself; ties
+    go to the earlier source. A source gets at most `max_queue` ticks ahead of
+    the engine before it is paused, and the merge waits for every unfinished
+    source to have a tick, so a slow feed holds the others back rather than
+    being reordered. If a source raises, the merge stops at once and the
+    error is re-raised.
+
+    max_undo, journal and record_trades work as in run_engine; record_trades
+    only applies to the context created here (a passed `ctx` keeps its own).
+    """
+    if max_queue < 1:
+        raise ValueError("max_queue must be >= 1")
+    strategies = strategies or default_strategies()
+    pub = publisher or SignalPublisher()
+    ctx = ctx if ctx is not None else ExecutionContext(cash=100_000.0, record_trades=record_trades)
+    inv = CommandInvoker(max_undo=max_undo, journal=journal)
+
+    queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=max_queue) for _ in sources]
+    pumps = [asyncio.create_task(_pump(src, q)) for src, q in zip(sources, queues)]
+    merge = asyncio.create_task(_merge(queues, strategies, pub, inv, ctx))
+
+    def stop_on_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            merge.cancel()
+
+    for task in pumps:
+        task.add_done_callback(stop_on_failure)
+    try:
+        await merge
+    except asyncio.CancelledError:
+        for task in pumps:
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        raise
+    finally:
+        merge.cancel()
+        for task in pumps:
+            task.cancel()
+    return ctx
@@ -3,7 +3,7 @@ from pathlib import Path
 
 from src.engine import run_engine
 from src.reporting import attach_default_observers
-from src.patterns.strategy import SignalPublisher
+from src.patterns.observer import SignalPublisher
 
 def main():
     root = Path(__file__).resolve().parents[2]
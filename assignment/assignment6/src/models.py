@@ -1,4 +1,4 @@
-from src.patterns.factory import Stock, Bond, ETF, InstrumentFactory
+from src.patterns.factory import Stock, Bond, ETF, InstrumentFactory, InstrumentRegistry, InstrumentView
 from src.composite import Position, PortfolioGroup
 
-__all__ = ["Stock", "Bond", "ETF", "InstrumentFactory", "Position", "PortfolioGroup"]
+__all__ = ["Stock", "Bond", "ETF", "InstrumentFactory", "InstrumentRegistry", "InstrumentView", "Position", "PortfolioGroup"]
@@ -1,16 +1,32 @@
 # command.py
 from __future__ import annotations
 
+import mmap
+import os
+import struct
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.patterns.strategy import Signal
 
 
 @dataclass
 class ExecutionContext:
+    """
+    Cash, positions and the trade log the order commands act on. `trades`
+    holds (event, Signal) tuples, not dicts; sig.to_dict() gives the old
+    dict form of an entry.
+    """
     cash: float = 0.0
     positions: Dict[str, float] = field(default_factory=dict)
-    trades: List[Dict] = field(default_factory=list)  # audit log
+    trades: List[Tuple[str, Signal]] = field(default_factory=list)  # audit log of ("EXECUTE" | "UNDO", signal)
+    record_trades: bool = True  # turn off when a CommandJournal keeps the audit trail
 
 
 class Command(ABC):
@@ -23,41 +39,88 @@ class Command(ABC):
         ...
 
 
+def _as_order(signal) -> Signal:
+    """Signal for an order; dict-style signals are converted. Needs symbol and qty."""
+    sig = signal if type(signal) is Signal else Signal.from_mapping(signal)
+    if sig.symbol is None or sig.qty is None:
+        raise KeyError("order signal needs 'symbol' and 'qty'")
+    return sig
+
+
 class ExecuteOrderCommand(Command):
     """
     Applies an order to context.positions and logs it.
     """
-    def __init__(self, context: ExecutionContext, signal: Dict):
+    def __init__(self, context: ExecutionContext, signal: Signal | Dict):
+        self.ctx = context
+        self.signal = signal if type(signal) is Signal else _as_order(signal)
+        self._applied = False
+
+    def _apply(self, sign: float, event: str) -> None:
+        sig, ctx = self.signal, self.ctx
+        delta = sign * float(sig.qty) if sig.action == "BUY" else -sign * float(sig.qty)
+        symbol = sig.symbol
+        ctx.positions[symbol] = ctx.positions.get(symbol, 0.0) + delta
+        ctx.cash -= delta * float(sig.price or 0.0)  # negative when buying, positive when selling
+        if ctx.record_trades:
+            ctx.trades.append((event, sig))
+
+    def execute(self) -> None:
+        if self._applied:
+            return
+        self._apply(1.0, "EXECUTE")
+        self._applied = True
+
+    def undo(self) -> None:
+        if not self._applied:
+            return
+        self._apply(-1.0, "UNDO")
+        self._applied = False
+
+
+class BatchOrderCommand(Command):
+    """
+    All orders of one tick as a single command: the trade log is extended in
+    one call and the invoker keeps one undo entry. Every order's quantity,
+    price and side are converted in the constructor, so a malformed order
+    raises before anything is applied; execute/undo then only add the stored
+    numbers, order by order, so positions and cash match one-by-one execution.
+    """
+    def __init__(self, context: ExecutionContext, signals: List[Signal | Dict]):
         self.ctx = context
-        self.signal = signal
+        orders, fills = [], []
+        for sig in signals:
+            if type(sig) is not Signal or sig.symbol is None or sig.qty is None:
+                sig = _as_order(sig)
+            qty = float(sig.qty)
+            delta = qty if sig.action == "BUY" else -qty
+            orders.append(sig)
+            fills.append((sig.symbol, delta, delta * float(sig.price or 0.0)))
+        self.signals = orders
+        self._fills = fills  # (symbol, position delta, cash outflow) per order
         self._applied = False
 
+    def _apply(self, sign: float, event: str) -> None:
+        ctx = self.ctx
+        positions, get = ctx.positions, ctx.positions.get
+        cash = ctx.cash
+        for symbol, delta, flow in self._fills:
+            positions[symbol] = get(symbol, 0.0) + sign * delta
+            cash -= sign * flow
+        ctx.cash = cash
+        if ctx.record_trades:
+            ctx.trades.extend([(event, sig) for sig in self.signals])
+
     def execute(self) -> None:
         if self._applied:
             return
-        side = str(self.signal.get("action", "")).upper()
-        symbol = self.signal["symbol"]
-        qty = float(self.signal["qty"])
-        price = float(self.signal.get("price", 0.0))
-
-        delta = qty if side == "BUY" else -qty
-        self.ctx.positions[symbol] = self.ctx.positions.get(symbol, 0.0) + delta
-        self.ctx.cash -= delta * price  # negative when buying, positive when selling
-        self.ctx.trades.append({"event": "EXECUTE", **self.signal})
+        self._apply(1.0, "EXECUTE")
         self._applied = True
 
     def undo(self) -> None:
         if not self._applied:
             return
-        side = str(self.signal.get("action", "")).upper()
-        symbol = self.signal["symbol"]
-        qty = float(self.signal["qty"])
-        price = float(self.signal.get("price", 0.0))
-
-        delta = qty if side == "BUY" else -qty
-        self.ctx.positions[symbol] = self.ctx.positions.get(symbol, 0.0) - delta
-        self.ctx.cash += delta * price
-        self.ctx.trades.append({"event": "UNDO", **self.signal})
+        self._apply(-1.0, "UNDO")
         self._applied = False
 
 
@@ -72,13 +135,154 @@ class UndoOrderCommand(Command):
         self.execute_cmd.execute()
 
 
+JOURNAL_EXECUTE = 0
+JOURNAL_UNDO = 1
+
+# kind, side (+1 BUY / -1 SELL), symbol id, qty, price, ts (epoch seconds, NaN if unknown)
+_RECORD = struct.Struct("<BbIddd")
+JOURNAL_DTYPE = np.dtype([("kind", "u1"), ("side", "i1"), ("symbol", "<u4"),
+                          ("qty", "<f8"), ("price", "<f8"), ("ts", "<f8")])
+_HEADER = struct.Struct("<4sIQ")  # magic, record size, committed record count
+_MAGIC = b"CMDJ"
+
+
+def _ts_seconds(ts) -> float:
+    if isinstance(ts, datetime):
+        return ts.timestamp()
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    return float("nan")
+
+
+class CommandJournal:
+    """
+    Append-only binary log of executed/undone orders in a memory-mapped file.
+    Records are fixed-size; the committed count in the header is advanced and
+    the mapping flushed (msync) every `flush_every` records and on close, so a
+    crash loses at most the last unflushed batch. Symbol names go to a
+    `<path>.symbols` sidecar, one per line, in id order.
+    """
+    def __init__(self, path: str | Path, flush_every: int = 4096, initial_records: int = 1 << 16):
+        self.path = Path(path)
+        self.flush_every = int(flush_every)
+        self._sym_path = Path(str(self.path) + ".symbols")
+        self.symbol_ids: Dict[str, int] = {}
+        if self._sym_path.exists():
+            for line in self._sym_path.read_text().splitlines():
+                self.symbol_ids[line] = len(self.symbol_ids)
+        self._sym_file = open(self._sym_path, "a")
+
+        new = not self.path.exists() or self.path.stat().st_size < _HEADER.size
+        self._f = open(self.path, "w+b" if new else "r+b")
+        if new:
+            self._f.write(_HEADER.pack(_MAGIC, _RECORD.size, 0))
+            self._f.truncate(_HEADER.size + initial_records * _RECORD.size)
+        self._mm = mmap.mmap(self._f.fileno(), 0)
+        magic, rec_size, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or rec_size != _RECORD.size:
+            raise ValueError(f"{self.path} is not a command journal")
+        self.count = count
+        self._unflushed = 0
+
+    def _grow(self) -> None:
+        self._mm.flush()
+        self._mm.close()
+        size = os.fstat(self._f.fileno()).st_size
+        self._f.truncate(_HEADER.size + 2 * (size - _HEADER.size))
+        self._mm = mmap.mmap(self._f.fileno(), 0)
+
+    def _symbol_id(self, symbol: str) -> int:
+        sid = self.symbol_ids.get(symbol)
+        if sid is None:
+            sid = self.symbol_ids[symbol] = len(self.symbol_ids)
+            self._sym_file.write(symbol + "\n")
+        return sid
+
+    def append(self, kind: int, signal: Signal | Dict) -> None:
+        signal = _as_order(signal)
+        side = 1 if signal.action == "BUY" else -1
+        offset = _HEADER.size + self.count * _RECORD.size
+        if offset + _RECORD.size > len(self._mm):
+            self._grow()
+        _RECORD.pack_into(self._mm, offset, kind, side, self._symbol_id(signal.symbol),
+                          float(signal.qty), float(signal.price or 0.0), _ts_seconds(signal.ts))
+        self.count += 1
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def record(self, cmd: "Command", undo: bool = False) -> None:
+        """Journal an order command being executed (or undone); other commands are ignored."""
+        if isinstance(cmd, UndoOrderCommand):
+            cmd, undo = cmd.execute_cmd, not undo
+        kind = JOURNAL_UNDO if undo else JOURNAL_EXECUTE
+        if isinstance(cmd, ExecuteOrderCommand):
+            self.append(kind, cmd.signal)
+        elif isinstance(cmd, BatchOrderCommand):
+            for sig in cmd.signals:
+                self.append(kind, sig)
+
+    def flush(self) -> None:
+        self._sym_file.flush()
+        os.fsync(self._sym_file.fileno())
+        _HEADER.pack_into(self._mm, 0, _MAGIC, _RECORD.size, self.count)
+        self._mm.flush()
+        self._unflushed = 0
+
+    def close(self) -> None:
+        if self._mm.closed:
+            return
+        self.flush()
+        self._mm.close()
+        self._f.close()
+        self._sym_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_journal(path: str | Path):
+    """(records as a structured NumPy array, symbol names by id); committed records only."""
+    path = Path(path)
+    raw = np.fromfile(path, dtype=np.uint8)
+    magic, rec_size, count = _HEADER.unpack_from(raw, 0)
+    if magic != _MAGIC or rec_size != JOURNAL_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a command journal")
+    records = np.frombuffer(raw, dtype=JOURNAL_DTYPE, count=count, offset=_HEADER.size)
+    symbols = Path(str(path) + ".symbols").read_text().splitlines()
+    return records, symbols
+
+
+def replay_journal(path: str | Path, cash: float = 0.0) -> ExecutionContext:
+    """Rebuild positions and cash from a journal with array operations (no per-record Python work)."""
+    records, symbols = read_journal(path)
+    sign = np.where(records["kind"] == JOURNAL_UNDO, -1.0, 1.0)
+    delta = sign * records["side"] * records["qty"]
+    pos = np.bincount(records["symbol"], weights=delta, minlength=len(symbols))
+    touched = np.bincount(records["symbol"], minlength=len(symbols)) > 0
+    ctx = ExecutionContext(cash=cash - float(np.dot(delta, records["price"])), record_trades=False)
+    ctx.positions = {symbols[i]: float(pos[i]) for i in np.flatnonzero(touched)}
+    return ctx
+
+
 class CommandInvoker:
-    def __init__(self):
-        self._undo_stack: List[Command] = []
-        self._redo_stack: List[Command] = []
+    """
+    Runs commands with undo/redo. max_undo bounds how many commands are kept
+    in memory for undo (oldest are forgotten); a CommandJournal, if given,
+    keeps the complete record on disk.
+    """
+    def __init__(self, max_undo: Optional[int] = None, journal: Optional[CommandJournal] = None):
+        self._undo_stack: Deque[Command] = deque(maxlen=max_undo)
+        self._redo_stack: Deque[Command] = deque(maxlen=max_undo)
+        self.journal = journal
 
     def execute(self, cmd: Command) -> None:
         cmd.execute()
+        if self.journal is not None:
+            self.journal.record(cmd)
         self._undo_stack.append(cmd)
         self._redo_stack.clear()
 
@@ -87,6 +291,8 @@ class CommandInvoker:
             return None
         cmd = self._undo_stack.pop()
         cmd.undo()
+        if self.journal is not None:
+            self.journal.record(cmd, undo=True)
         self._redo_stack.append(cmd)
         return cmd
 
@@ -95,6 +301,8 @@ class CommandInvoker:
             return None
         cmd = self._redo_stack.pop()
         cmd.execute()
+        if self.journal is not None:
+            self.journal.record(cmd)
         self._undo_stack.append(cmd)
         return cmd
 
@@ -1,5 +1,9 @@
 # factory.py
-import pandas as pd
+import csv
+import sys
+from pathlib import Path
+
+import numpy as np
 
 class Stock:
     def __init__(self, data: dict):
@@ -26,20 +30,163 @@ class ETF:
         self.sector = data.get("sector")
         self.issuer = data.get("issuer")
 
+INSTRUMENT_TYPES = {"Stock": Stock, "Bond": Bond, "ETF": ETF}
+_TYPE_NAMES = tuple(INSTRUMENT_TYPES)
+_TYPE_CODES = {name: code for code, name in enumerate(_TYPE_NAMES)}
+
 class InstrumentFactory:
     @staticmethod
     def create_instrument(data: dict):
         instrument_type = data.get("type")
-        if instrument_type == "Stock":
-            return Stock(data)
-        elif instrument_type == "Bond":
-            return Bond(data)
-        elif instrument_type == "ETF":
-            return ETF(data)
-        else:
+        cls = INSTRUMENT_TYPES.get(instrument_type)
+        if cls is None:
             raise ValueError(f"Unknown instrument type: {instrument_type}")
+        return cls(data)
+
+    @staticmethod
+    def load_registry(path) -> "InstrumentRegistry":
+        return InstrumentRegistry.load_csv(path)
+
+class InstrumentView:
+    """
+    Read-only handle on one registry row: two slots, fields are read from the
+    registry columns on access. to_instrument() builds the full factory object.
+    """
+    __slots__ = ("_reg", "id")
+
+    def __init__(self, registry: "InstrumentRegistry", iid: int):
+        self._reg = registry
+        self.id = iid
+
+    @property
+    def symbol(self):
+        return self._reg.symbols[self.id]
+
+    @property
+    def type(self):
+        return _TYPE_NAMES[self._reg.type_codes[self.id]]
+
+    @property
+    def price(self):
+        return float(self._reg.prices[self.id])
+
+    @property
+    def sector(self):
+        return self._reg.sector_names[self._reg.sector_ids[self.id]]
+
+    @property
+    def issuer(self):
+        return self._reg.issuer_names[self._reg.issuer_ids[self.id]]
+
+    @property
+    def maturity(self):
+        return self._reg.maturities.get(self.id)
+
+    def to_dict(self) -> dict:
+        return {"symbol": self.symbol, "type": self.type, "price": self.price,
+                "sector": self.sector, "issuer": self.issuer, "maturity": self.maturity}
+
+    def to_instrument(self):
+        return InstrumentFactory.create_instrument(self.to_dict())
+
+    def __eq__(self, other):
+        return isinstance(other, InstrumentView) and other._reg is self._reg and other.id == self.id
+
+    def __hash__(self):
+        return hash((id(self._reg), self.id))
+
+    def __repr__(self):
+        return f"InstrumentView({self.symbol}, {self.type}, price={self.price})"
+
+class InstrumentRegistry:
+    """
+    Columnar instrument master. Row i is instrument id i: interned symbols, type
+    codes, prices, and sector/issuer ids into small name tables; maturities are
+    kept sparsely. Symbol, sector and type lookups are dict hits; sector/type
+    indexes are id arrays built once at load.
+    """
+    def __init__(self, symbols, type_codes, prices, sector_ids, sector_names, issuer_ids, issuer_names, maturities):
+        self.symbols = symbols
+        self.type_codes = type_codes
+        self.prices = prices
+        self.sector_ids = sector_ids
+        self.sector_names = sector_names
+        self.issuer_ids = issuer_ids
+        self.issuer_names = issuer_names
+        self.maturities = maturities
+        self._by_symbol = {sym: i for i, sym in enumerate(symbols)}
+        if len(self._by_symbol) != len(symbols):
+            raise ValueError("duplicate symbols in instrument master")
+        self._by_sector = self._group(sector_ids, sector_names)
+        self._by_type = self._group(type_codes, _TYPE_NAMES)
+
+    @staticmethod
+    def _group(codes: np.ndarray, names) -> dict:
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+        return {name: order[bounds[i]:bounds[i + 1]] for i, name in enumerate(names)}
+
+    @classmethod
+    def from_rows(cls, rows) -> "InstrumentRegistry":
+        """Bulk-build from dicts with the instruments.csv columns."""
+        symbols, types, prices, sectors, issuers, maturities = [], [], [], [], [], {}
+        sector_ids, issuer_ids = {}, {}
+        intern = sys.intern
+        for i, row in enumerate(rows):
+            code = _TYPE_CODES.get(row.get("type"))
+            if code is None:
+                raise ValueError(f"Unknown instrument type: {row.get('type')}")
+            symbols.append(intern(row["symbol"]))
+            types.append(code)
+            price = row.get("price")
+            prices.append(float(price) if price not in (None, "") else float("nan"))
+            sectors.append(sector_ids.setdefault(row.get("sector") or "", len(sector_ids)))
+            issuers.append(issuer_ids.setdefault(row.get("issuer") or "", len(issuer_ids)))
+            maturity = row.get("maturity")
+            if maturity and maturity == maturity:  # skips "" and NaN
+                maturities[i] = maturity
+        return cls(symbols, np.array(types, dtype=np.int8), np.array(prices, dtype=float),
+                   np.array(sectors, dtype=np.int32), list(sector_ids),
+                   np.array(issuers, dtype=np.int32), list(issuer_ids), maturities)
+
+    @classmethod
+    def load_csv(cls, path) -> "InstrumentRegistry":
+        with open(Path(path), newline="") as f:
+            return cls.from_rows(csv.DictReader(f))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol) -> bool:
+        return symbol in self._by_symbol
+
+    def id_of(self, symbol: str) -> int:
+        return self._by_symbol[symbol]
+
+    def get(self, symbol: str):
+        iid = self._by_symbol.get(symbol)
+        return None if iid is None else InstrumentView(self, iid)
+
+    def view(self, iid: int) -> InstrumentView:
+        if not 0 <= iid < len(self.symbols):
+            raise IndexError(iid)
+        return InstrumentView(self, iid)
+
+    def ids_by_sector(self, sector: str) -> np.ndarray:
+        return self._by_sector.get(sector, np.empty(0, dtype=np.intp))
+
+    def ids_by_type(self, instrument_type: str) -> np.ndarray:
+        return self._by_type.get(instrument_type, np.empty(0, dtype=np.intp))
+
+    def by_sector(self, sector: str) -> list:
+        return [InstrumentView(self, int(i)) for i in self.ids_by_sector(sector)]
+
+    def by_type(self, instrument_type: str) -> list:
+        return [InstrumentView(self, int(i)) for i in self.ids_by_type(instrument_type)]
 
 if __name__ == "__main__":
+    import pandas as pd
+
     data = pd.read_csv("../data/instruments.csv")
     dataList = data.to_dict(orient = "records")
     instruments = [InstrumentFactory.create_instrument(item) for item in dataList]
@@ -1,64 +1,594 @@
 from __future__ import annotations
 
+import os
+import queue
+import threading
+import time
+import zipfile
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List, Optional
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Deque, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src.patterns.strategy import Signal
+
+
+def _accepts(values: frozenset, value) -> bool:
+    try:
+        return value in values
+    except TypeError:  # unhashable, so it cannot be one of the filter values
+        return False
 
 
 class Observer(ABC):
+    # default subscription filters used when attach() is called without any,
+    # e.g. MappingProxyType({"type": "ORDER"}); see SignalPublisher.attach
+    topics: Optional[Mapping] = None
+
     @abstractmethod
-    def update(self, signal: Dict) -> None:
+    def update(self, signal: Signal) -> None:
         ...
 
 
 class SignalPublisher:
-    """Simple pub-sub for signals."""
+    """
+    Simple pub-sub for signals, with optional per-observer filters on type,
+    symbol, strategy and action. The observers matching each distinct
+    (type, symbol, strategy, action) are worked out once and kept in a routing
+    table, so a signal only reaches its subscribers. Subscription changes
+    replace the observer list, filters and routing table rather than mutating
+    them, so a reader holding the old ones sees a consistent set. A signal
+    with an unhashable field value is matched without caching; filters on
+    that field never accept it. Dict-style signals are converted to Signal on
+    the way in, so observers always get a Signal.
+    """
+    TOPIC_FIELDS = ("type", "symbol", "strategy", "action")
+
     def __init__(self):
         self._observers: List[Observer] = []
+        self._filters: Dict[int, Tuple] = {}  # id(observer) -> one frozenset (or None = any) per field
+        self._routes: Dict[Tuple, Tuple[Observer, ...]] = {}
 
-    def attach(self, obs: Observer) -> None:
+    def attach(self, obs: Observer, **topics) -> None:
+        """
+        Subscribe `obs`. Keyword filters (type=, symbol=, strategy=, action=)
+        take a value or a collection of values; omitted fields match anything.
+        Without filters the observer's own `topics` apply. Attaching an
+        observer again replaces its filters.
+        """
+        unknown = set(topics) - set(self.TOPIC_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown topic fields: {sorted(unknown)}")
+        topics = topics or getattr(obs, "topics", None) or {}
+        filters = []
+        for name in self.TOPIC_FIELDS:
+            want = topics.get(name)
+            if want is None:
+                filters.append(None)
+            elif isinstance(want, (str, bytes)) or not hasattr(want, "__iter__"):
+                filters.append(frozenset([want]))
+            else:
+                filters.append(frozenset(want))
         if obs not in self._observers:
-            self._observers.append(obs)
+            self._observers = [*self._observers, obs]
+        self._filters = {**self._filters, id(obs): tuple(filters)}
+        self._routes = {}
 
     def detach(self, obs: Observer) -> None:
         if obs in self._observers:
-            self._observers.remove(obs)
+            self._observers = [o for o in self._observers if o is not obs]
+            self._filters = {k: v for k, v in self._filters.items() if k != id(obs)}
+            self._routes = {}
+
+    @staticmethod
+    def _matching(observers, filters, key: Tuple) -> Tuple[Observer, ...]:
+        return tuple(obs for obs in observers
+                     if all(f is None or _accepts(f, v) for f, v in zip(filters[id(obs)], key)))
+
+    @classmethod
+    def _route_in(cls, routes, observers, filters, signal: Signal) -> Tuple[Observer, ...]:
+        key = (signal.type, signal.symbol, signal.strategy, signal.action)
+        try:
+            hit = routes.get(key)
+        except TypeError:  # unhashable field value: match it, but don't cache it
+            return cls._matching(observers, filters, key)
+        if hit is None:
+            hit = routes[key] = cls._matching(observers, filters, key)
+        return hit
+
+    def _route(self, signal: Signal) -> Tuple[Observer, ...]:
+        return self._route_in(self._routes, self._observers, self._filters, signal)
 
-    def notify(self, signal: Dict) -> None:
-        for obs in list(self._observers):
+    def subscribers(self, signal: Signal | Dict) -> Tuple[Observer, ...]:
+        """Observers that a signal would be delivered to."""
+        return self._route(Signal.from_mapping(signal))
+
+    def notify(self, signal: Signal | Dict) -> None:
+        if type(signal) is not Signal:
+            signal = Signal.from_mapping(signal)
+        for obs in self._route(signal):
             try:
                 obs.update(signal)
             except Exception:
                 pass
 
 
+class AsyncSignalPublisher(SignalPublisher):
+    """
+    SignalPublisher whose notify() only enqueues; a background dispatcher thread
+    delivers to observers in micro-batches, so observer cost stays off the
+    caller's (engine loop's) path. Observers with an update_batch(signals)
+    method get the whole batch in one call.
+
+    overflow, when max_queue signals are pending:
+      "block"       - notify() waits for room
+      "drop_oldest" - the oldest pending signal is discarded
+      "sample"      - only every `sample_every`-th incoming signal is kept
+                      (replacing the oldest); the rest are dropped
+    """
+    OVERFLOW_POLICIES = ("block", "drop_oldest", "sample")
+
+    def __init__(self, max_queue: int = 10_000, batch_size: int = 256,
+                 overflow: str = "block", sample_every: int = 10):
+        super().__init__()
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if max_queue < 1 or batch_size < 1 or sample_every < 1:
+            raise ValueError("max_queue, batch_size and sample_every must be >= 1")
+        self.max_queue = int(max_queue)
+        self.batch_size = int(batch_size)
+        self.overflow = overflow
+        self.sample_every = int(sample_every)
+
+        self._queue: Deque[Tuple[float, Signal]] = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._overflow_seen = 0
+
+        self.enqueued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="signal-dispatcher", daemon=True)
+        self._thread.start()
+
+    def notify(self, signal: Signal | Dict) -> None:
+        if type(signal) is not Signal:
+            signal = Signal.from_mapping(signal)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("publisher is closed")
+            q = self._queue
+            if len(q) >= self.max_queue:
+                if self.overflow == "block":
+                    while len(q) >= self.max_queue and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        raise RuntimeError("publisher is closed")
+                else:
+                    self._overflow_seen += 1
+                    if self.overflow == "sample" and self._overflow_seen % self.sample_every:
+                        self.dropped += 1
+                        return
+                    q.popleft()
+                    self.dropped += 1
+            q.append((time.perf_counter(), signal))
+            self.enqueued += 1
+            if len(q) > self.max_depth:
+                self.max_depth = len(q)
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                n = min(self.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(n)]
+                # the batch is routed against the subscriptions as they were when
+                # it was taken off the queue; attach/detach replace, never mutate
+                # them, so the shared routing table can be filled outside the lock
+                observers, filters, routes = self._observers, self._filters, self._routes
+                self._busy = True
+                self._cond.notify_all()  # room for blocked producers
+
+            per_observer: Dict[int, List[Signal]] = {}
+            route_in = self._route_in
+            for _, sig in batch:
+                for obs in route_in(routes, observers, filters, sig):
+                    per_observer.setdefault(id(obs), []).append(sig)
+            for obs in observers:
+                signals = per_observer.get(id(obs))
+                if not signals:
+                    continue
+                try:
+                    update_batch = getattr(obs, "update_batch", None)
+                    if update_batch is not None:
+                        update_batch(signals)
+                    else:
+                        for sig in signals:
+                            obs.update(sig)
+                except Exception:
+                    pass
+            lag = time.perf_counter() - batch[0][0]
+
+            with self._cond:
+                self.delivered += n
+                self.last_lag = lag
+                if lag > self.max_lag:
+                    self.max_lag = lag
+                self._busy = False
+                self._cond.notify_all()
+
+    def attach(self, obs: Observer, **topics) -> None:
+        with self._cond:
+            super().attach(obs, **topics)
+
+    def detach(self, obs: Observer) -> None:
+        with self._cond:
+            super().detach(obs)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def metrics(self) -> Dict:
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "max_depth": self.max_depth,
+                "enqueued": self.enqueued,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "last_lag": self.last_lag,
+                "max_lag": self.max_lag,
+            }
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything enqueued so far has been delivered."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Drain the queue and stop the dispatcher thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 class LoggerObserver(Observer):
     """Logs all signals via a provided callable or print."""
     def __init__(self, log_fn: Optional[Callable[[str], None]] = None):
         self.log_fn = log_fn or (lambda s: print(s))
 
-    def update(self, signal: Dict) -> None:
-        self.log_fn(f"[LOG] {signal.get('ts')} | {signal.get('strategy')} | "
-                    f"{signal.get('action')} {signal.get('qty')} {signal.get('symbol')} @ {signal.get('price')} | "
-                    f"{signal.get('reason')}")
+    def update(self, signal: Signal) -> None:
+        self.log_fn(f"[LOG] {signal.ts} | {signal.strategy} | "
+                    f"{signal.action} {signal.qty} {signal.symbol} @ {signal.price} | "
+                    f"{signal.reason}")
 
 
 class AlertObserver(Observer):
     """Alerts when notional (|qty|*price) >= threshold."""
+    topics = MappingProxyType({"type": "ORDER"})
+
     def __init__(self, notional_threshold: float = 10000.0,
                  alert_fn: Optional[Callable[[str], None]] = None):
         self.threshold = float(notional_threshold)
         self.alert_fn = alert_fn or (lambda s: print(s))
 
-    def update(self, signal: Dict) -> None:
-        if signal.get("type") != "ORDER":
+    def update(self, signal: Signal) -> None:
+        if signal.type != "ORDER":
             return
-        qty = abs(float(signal.get("qty", 0)))
-        price = float(signal.get("price", 0.0))
+        qty = abs(float(signal.qty or 0))
+        price = float(signal.price or 0.0)
         notion = qty * price
         if notion >= self.threshold:
             self.alert_fn(f"[ALERT] Large trade: ${notion:,.2f} | {signal}")
 
 
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:  # pragma: no cover - optional dependency
+        raise ImportError("arrow/parquet signal sinks require pyarrow") from e
+    return pa
+
+
+_CATEGORICAL = ("type", "action", "symbol", "strategy")
+
+
+def _sink_ts(ts) -> Optional[datetime]:
+    """A signal ts as naive UTC for a datetime64 column; ISO strings are parsed, None stays missing."""
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    if isinstance(ts, datetime):
+        return ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo else ts
+    if ts is None:
+        return None
+    raise TypeError(f"signal ts must be a datetime or ISO string, got {type(ts).__name__}")
+
+
+class _NpzChunkWriter:
+    """Fallback without pyarrow: every chunk is a group of .npy members in one zip file."""
+    ext = "npz"
+
+    def __init__(self, path: Path):
+        self._fh = open(path, "wb")
+        self._zip = zipfile.ZipFile(self._fh, "w", zipfile.ZIP_STORED)
+        self._chunks = 0
+
+    def write(self, columns: Dict[str, np.ndarray], dictionaries: Dict[str, List[str]]) -> None:
+        prefix = f"{self._chunks:06d}"
+        arrays = dict(columns)
+        arrays.update({f"{name}__dict": np.array(values, dtype=str) for name, values in dictionaries.items()})
+        for name, arr in arrays.items():
+            with self._zip.open(f"{prefix}/{name}.npy", "w", force_zip64=True) as f:
+                np.lib.format.write_array(f, arr, allow_pickle=False)
+        self._chunks += 1
+
+    @property
+    def bytes_written(self) -> int:
+        return self._fh.tell()
+
+    def close(self) -> None:
+        self._zip.close()
+        self._fh.close()
+
+
+class _ArrowChunkWriter:
+    """Arrow IPC stream (dictionary-encoded text columns) or Parquet row groups."""
+    def __init__(self, path: Path, fmt: str):
+        self.pa = _require_pyarrow()
+        self.fmt = fmt
+        self._fh = open(path, "wb")
+        self._writer = None
+
+    def _batch(self, columns, dictionaries):
+        pa = self.pa
+        arrays, names = [], []
+        for name, arr in columns.items():
+            if name in dictionaries:
+                arr = pa.DictionaryArray.from_arrays(pa.array(arr), pa.array(dictionaries[name], pa.string()))
+            else:
+                arr = pa.array(arr)
+            arrays.append(arr)
+            names.append(name)
+        return pa.RecordBatch.from_arrays(arrays, names=names)
+
+    def write(self, columns: Dict[str, np.ndarray], dictionaries: Dict[str, List[str]]) -> None:
+        batch = self._batch(columns, dictionaries)
+        if self._writer is None:
+            if self.fmt == "parquet":
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self._fh, batch.schema)
+            else:
+                options = self.pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+                self._writer = self.pa.ipc.new_stream(self._fh, batch.schema, options=options)
+        if self.fmt == "parquet":
+            self._writer.write_table(self.pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+    @property
+    def bytes_written(self) -> int:
+        return self._fh.tell()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._fh.close()
+
+
+class ColumnarSignalSink(Observer):
+    """
+    Audit-trail observer: signals are buffered column by column (text fields
+    dictionary-encoded to int32 codes), and every `chunk_size` rows the chunk
+    is converted to typed arrays (ts as datetime64[us]; a ts that is neither
+    a datetime, an ISO string nor None is rejected) and handed to a writer
+    thread. A closed sink raises on update and flush. Files are
+    "arrow" (IPC stream) or "parquet" (both need pyarrow) or "npz" (numpy only),
+    named <prefix>-NNNNN.<ext> in `directory`, and rotated once a file reaches
+    max_bytes or has been open max_seconds (checked when a chunk is written).
+    reason is skipped unless include_reason, as formatting it costs per signal.
+    """
+    FORMATS = ("arrow", "parquet", "npz")
+
+    def __init__(self, directory: str | Path, fmt: str = "arrow", chunk_size: int = 65_536,
+                 max_bytes: Optional[int] = 256 * 1024 * 1024, max_seconds: Optional[float] = None,
+                 prefix: str = "signals", include_reason: bool = False, max_pending: int = 4):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown format: {fmt}")
+        if fmt != "npz":
+            _require_pyarrow()
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.chunk_size = int(chunk_size)
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.prefix = prefix
+        self.include_reason = include_reason
+        self.files: List[Path] = []
+        self.rows_written = 0
+
+        self._codes: Dict[str, Dict] = {name: {} for name in _CATEGORICAL}
+        self._values: Dict[str, List[str]] = {name: [] for name in _CATEGORICAL}
+        self._new_columns()
+
+        self._writer = None
+        self._opened_at = 0.0
+        self._error: Optional[BaseException] = None
+        self._pending: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="signal-sink", daemon=True)
+        self._thread.start()
+
+    # ---- producer side ------------------------------------------------------
+    def _new_columns(self) -> None:
+        # plain list appends are cheaper per signal than numpy item assignment;
+        # the lists become typed arrays once per chunk
+        self._cols = {name: [] for name in (*_CATEGORICAL, "qty", "price", "ts")}
+        if self.include_reason:
+            self._cols["reason"] = []
+        self._n = 0
+
+    def _code(self, name: str, value) -> int:
+        codes = self._codes[name]
+        code = codes[value] = len(codes)
+        self._values[name].append("" if value is None else str(value))
+        return code
+
+    def update(self, signal: Signal) -> None:
+        if self._closed:
+            raise RuntimeError("signal sink is closed")
+        ts = _sink_ts(signal.ts)  # validated before any column is touched
+        cols, codes = self._cols, self._codes
+        for name, value in zip(_CATEGORICAL, (signal.type, signal.action, signal.symbol, signal.strategy)):
+            code = codes[name].get(value)
+            cols[name].append(self._code(name, value) if code is None else code)
+        cols["qty"].append(signal.qty or 0.0)
+        cols["price"].append(signal.price or 0.0)
+        cols["ts"].append(ts)
+        if self.include_reason:
+            cols["reason"].append(str(signal.reason))
+        self._n += 1
+        if self._n == self.chunk_size:
+            self._submit()
+
+    def update_batch(self, signals: Iterable[Signal]) -> None:
+        for sig in signals:
+            self.update(sig)
+
+    def _submit(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("signal sink writer failed") from self._error
+        if not self._n:
+            return
+        cols = self._cols
+        columns = {name: np.array(cols[name], dtype=np.int32) for name in _CATEGORICAL}
+        columns["qty"] = np.array(cols["qty"], dtype=float)
+        columns["price"] = np.array(cols["price"], dtype=float)
+        columns["ts"] = np.array(cols["ts"], dtype="datetime64[us]")
+        if self.include_reason:
+            columns["reason"] = np.array(cols["reason"], dtype=str)
+        dictionaries = {name: list(values) for name, values in self._values.items()}
+        self._pending.put((columns, dictionaries))
+        self._new_columns()
+
+    def flush(self) -> None:
+        """Write out the partial chunk and wait until the writer has caught up."""
+        if self._closed:
+            raise RuntimeError("signal sink is closed")
+        self._submit()
+        done = threading.Event()
+        self._pending.put(done)
+        done.wait()
+        if self._error is not None:
+            raise RuntimeError("signal sink writer failed") from self._error
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._pending.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- writer thread ------------------------------------------------------
+    def _open(self) -> None:
+        path = self.directory / f"{self.prefix}-{len(self.files):05d}.{self.fmt}"
+        self._writer = _NpzChunkWriter(path) if self.fmt == "npz" else _ArrowChunkWriter(path, self.fmt)
+        self._opened_at = time.monotonic()
+        self.files.append(path)
+
+    def _close_file(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _run(self) -> None:
+        while True:
+            item = self._pending.get()
+            if item is None:
+                self._close_file()
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            if self._error is not None:
+                continue
+            try:
+                if self._writer is None:
+                    self._open()
+                columns, dictionaries = item
+                self._writer.write(columns, dictionaries)
+                self.rows_written += len(columns["price"])
+                if ((self.max_bytes and self._writer.bytes_written >= self.max_bytes) or
+                        (self.max_seconds and time.monotonic() - self._opened_at >= self.max_seconds)):
+                    self._close_file()
+            except BaseException as e:
+                self._error = e
+
+
+def load_signals(paths: Iterable[str | Path]):
+    """Read files written by ColumnarSignalSink back into one pandas DataFrame."""
+    import pandas as pd
+    frames = []
+    for path in map(Path, paths):
+        if path.suffix == ".npz":
+            with np.load(path, allow_pickle=False) as z:
+                for prefix in sorted({name.split("/")[0] for name in z.files}):
+                    cols = {name.split("/")[1]: z[name] for name in z.files if name.startswith(prefix + "/")}
+                    frame = {}
+                    for name, arr in cols.items():
+                        if name.endswith("__dict"):
+                            continue
+                        if name + "__dict" in cols:
+                            arr = cols[name + "__dict"].astype(object)[arr]
+                        frame[name] = arr
+                    frames.append(pd.DataFrame(frame))
+        elif path.suffix == ".parquet":
+            _require_pyarrow()
+            import pyarrow.parquet as pq
+            frames.append(pq.read_table(path).to_pandas())
+        else:
+            pa = _require_pyarrow()
+            with pa.ipc.open_stream(path) as reader:
+                frames.append(reader.read_all().to_pandas())
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
 if __name__ == "__main__":
     pub = SignalPublisher()
     logs: List[str] = []
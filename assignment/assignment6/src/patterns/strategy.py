@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections import deque, defaultdict
+from collections import defaultdict
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from math import sqrt
-from typing import Deque, Dict, List, Optional
+from functools import partial
+from typing import Dict, List, Optional
+
+from src.indicators import RollingStats, RollingMax, RollingMin, RollingMedian
 
 try:
     from singleton import Config  # type: ignore
@@ -22,49 +25,78 @@ class MarketDataPoint:
     volume: Optional[float] = None
 
 
-class Strategy(ABC):
-    """Base interface; each tick returns 0..n signals (dicts)."""
+class Signal(Mapping):
+    """
+    Compact slotted signal. `reason` is rendered from the stored format string
+    and numbers only when someone reads it. Engine code, commands and observers
+    read the attributes (sig.action, sig.qty, ...); the read-only dict-style
+    access (sig["price"], sig.get(...), {**sig}) is there for outside callers
+    and is much slower. A string `action` is upper-cased ("buy" -> "BUY").
+    """
+    __slots__ = ("type", "action", "symbol", "qty", "price", "ts", "strategy", "_reason", "_reason_args")
+    FIELDS = ("type", "action", "symbol", "qty", "price", "reason", "ts", "strategy")
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, type, action, symbol, qty, price, ts, strategy, reason="", reason_args=None):
+        self.type = type
+        self.action = action.upper() if isinstance(action, str) else action
+        self.symbol = symbol
+        self.qty = qty
+        self.price = price
+        self.ts = ts
+        self.strategy = strategy
+        self._reason = reason
+        self._reason_args = reason_args
+
+    @classmethod
+    def from_mapping(cls, data) -> "Signal":
+        """A Signal from a dict-style signal (a Signal is returned as is); missing fields are None."""
+        if isinstance(data, Signal):
+            return data
+        get = data.get
+        return cls(get("type"), get("action"), get("symbol"), get("qty"), get("price"),
+                   get("ts"), get("strategy"), get("reason", ""))
 
-    @abstractmethod
-    def generate_signals(self, tick: MarketDataPoint | Dict) -> List[Dict]:
-        ...
+    @property
+    def reason(self) -> str:
+        if self._reason_args is not None:
+            self._reason = self._reason.format(*self._reason_args)
+            self._reason_args = None
+        return self._reason
 
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        raise KeyError(key)
 
+    def get(self, key, default=None):
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        return default
 
-class _RollingStats:
-    """Fixed-window rolling mean/std for a single stream."""
-    def __init__(self, window: int):
-        self.window = int(window)
-        self.q: Deque[float] = deque(maxlen=self.window)
-        self._sum = 0.0
-        self._sum2 = 0.0
+    def __contains__(self, key) -> bool:
+        return key in self._FIELD_SET
 
-    def add(self, x: float):
-        if len(self.q) == self.window:
-            old = self.q[0]
-            self._sum -= old
-            self._sum2 -= old * old
-        self.q.append(x)
-        self._sum += x
-        self._sum2 += x * x
+    def __iter__(self):
+        return iter(self.FIELDS)
 
-    @property
-    def ready(self) -> bool:
-        return len(self.q) == self.window
+    def __len__(self) -> int:
+        return len(self.FIELDS)
 
-    @property
-    def mean(self) -> float:
-        n = len(self.q)
-        return self._sum / n if n else 0.0
+    def to_dict(self) -> Dict:
+        return {k: getattr(self, k) for k in self.FIELDS}
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+class Strategy(ABC):
+    """Base interface; each tick returns 0..n Signal objects."""
+
+    @abstractmethod
+    def generate_signals(self, tick: MarketDataPoint | Dict) -> List[Signal]:
+        ...
 
-    @property
-    def std(self) -> float:
-        n = len(self.q)
-        if n <= 1:
-            return 0.0
-        mean = self._sum / n
-        var = max(self._sum2 / n - mean * mean, 0.0)
-        return sqrt(var)
 
 
 def _coerce_tick(tick: MarketDataPoint | Dict) -> MarketDataPoint:
@@ -83,6 +115,7 @@ def _coerce_tick(tick: MarketDataPoint | Dict) -> MarketDataPoint:
 class MeanReversionStrategy(Strategy):
     """
     Buys when price << rolling mean (k std), sells when price >> mean (+k std).
+    center="median" measures the deviation from the rolling median instead.
     Keeps per-symbol rolling state.
     """
     def __init__(
@@ -91,6 +124,7 @@ class MeanReversionStrategy(Strategy):
         k: Optional[float] = None,
         qty: Optional[int] = None,
         params: Optional[Dict] = None,
+        center: Optional[str] = None,
     ):
         cfg_params = {}
         if params:
@@ -105,46 +139,38 @@ class MeanReversionStrategy(Strategy):
         self.window = int(window or cfg_params.get("window", 20))
         self.k = float(k or cfg_params.get("k", 2.0))
         self.qty = int(qty or cfg_params.get("qty", 10))
+        self.center = str(center or cfg_params.get("center", "mean"))
+        if self.center not in ("mean", "median"):
+            raise ValueError(f"Unknown center: {self.center}")
 
-        self.stats: Dict[str, _RollingStats] = defaultdict(lambda: _RollingStats(self.window))
+        self.stats: Dict[str, RollingStats] = defaultdict(partial(RollingStats, self.window))
+        self.medians: Dict[str, RollingMedian] = defaultdict(partial(RollingMedian, self.window))
 
-    def generate_signals(self, tick: MarketDataPoint | Dict) -> List[Dict]:
+    def generate_signals(self, tick: MarketDataPoint | Dict) -> List[Signal]:
         t = _coerce_tick(tick)
         rs = self.stats[t.symbol]
         rs.add(t.price)
+        if self.center == "median":
+            med = self.medians[t.symbol]
+            med.add(t.price)
 
         if not rs.ready:
             return []
 
-        mu, sd = rs.mean, rs.std
+        mu = med.value if self.center == "median" else rs.mean
+        sd = rs.std
         if sd == 0.0:
             return []
 
         z = (t.price - mu) / sd
-        signals: List[Dict] = []
+        signals: List[Signal] = []
 
         if z <= -self.k:
-            signals.append({
-                "type": "ORDER",
-                "action": "BUY",
-                "symbol": t.symbol,
-                "qty": self.qty,
-                "price": t.price,
-                "reason": f"MeanReversion z={z:.2f} <= -{self.k}",
-                "ts": t.timestamp,
-                "strategy": "MeanReversion",
-            })
+            signals.append(Signal("ORDER", "BUY", t.symbol, self.qty, t.price, t.timestamp, "MeanReversion",
+                                  "MeanReversion z={:.2f} <= -{}", (z, self.k)))
         elif z >= self.k:
-            signals.append({
-                "type": "ORDER",
-                "action": "SELL",
-                "symbol": t.symbol,
-                "qty": self.qty,
-                "price": t.price,
-                "reason": f"MeanReversion z={z:.2f} >= {self.k}",
-                "ts": t.timestamp,
-                "strategy": "MeanReversion",
-            })
+            signals.append(Signal("ORDER", "SELL", t.symbol, self.qty, t.price, t.timestamp, "MeanReversion",
+                                  "MeanReversion z={:.2f} >= {}", (z, self.k)))
 
         return signals
 
@@ -173,41 +199,27 @@ class BreakoutStrategy(Strategy):
         self.lookback = int(lookback or cfg_params.get("lookback", 20))
         self.qty = int(qty or cfg_params.get("qty", 10))
 
-        self.windows: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.lookback))
+        self.highs: Dict[str, RollingMax] = defaultdict(partial(RollingMax, self.lookback))
+        self.lows: Dict[str, RollingMin] = defaultdict(partial(RollingMin, self.lookback))
 
-    def generate_signals(self, tick: MarketDataPoint | Dict) -> List[Dict]:
+    def generate_signals(self, tick: MarketDataPoint | Dict) -> List[Signal]:
         t = _coerce_tick(tick)
-        w = self.windows[t.symbol]
+        hi, lo = self.highs[t.symbol], self.lows[t.symbol]
 
-        prior_high = max(w) if w else None
-        prior_low = min(w) if w else None
+        prior_high = hi.value
+        prior_low = lo.value
 
-        signals: List[Dict] = []
-        if len(w) == self.lookback:
+        signals: List[Signal] = []
+        if hi.ready:
             if prior_high is not None and t.price > prior_high:
-                signals.append({
-                    "type": "ORDER",
-                    "action": "BUY",
-                    "symbol": t.symbol,
-                    "qty": self.qty,
-                    "price": t.price,
-                    "reason": f"Breakout > {prior_high:.4f}",
-                    "ts": t.timestamp,
-                    "strategy": "Breakout",
-                })
+                signals.append(Signal("ORDER", "BUY", t.symbol, self.qty, t.price, t.timestamp, "Breakout",
+                                      "Breakout > {:.4f}", (prior_high,)))
             elif prior_low is not None and t.price < prior_low:
-                signals.append({
-                    "type": "ORDER",
-                    "action": "SELL",
-                    "symbol": t.symbol,
-                    "qty": self.qty,
-                    "price": t.price,
-                    "reason": f"Breakdown < {prior_low:.4f}",
-                    "ts": t.timestamp,
-                    "strategy": "Breakout",
-                })
-
-        w.append(t.price)
+                signals.append(Signal("ORDER", "SELL", t.symbol, self.qty, t.price, t.timestamp, "Breakout",
+                                      "Breakdown < {:.4f}", (prior_low,)))
+
+        hi.add(t.price)
+        lo.add(t.price)
         return signals
 
 
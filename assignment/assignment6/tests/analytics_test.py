@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.decorator import Instrument
+from src.analytics import compute_all_metrics, compute_universe_metrics
+
+def _make_market_data(n_days=40, symbols=('AAA', 'BBB', 'CCC', 'SPY'), seed=0):
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range('2024-01-01', periods=n_days, freq='D')
+    frames = []
+    for sym in symbols:
+        prices = 100 * np.cumprod(1 + rng.normal(0, 0.02, n_days))
+        frames.append(pd.DataFrame({'timestamp': ts, 'symbol': sym, 'price': prices}))
+    return pd.concat(frames).sample(frac=1.0, random_state=1).reset_index(drop=True)
+
+def test_universe_metrics_match_decorators_on_aligned_data():
+    market_data = _make_market_data()
+    book = [Instrument(sym, 100, 10) for sym in ('AAA', 'BBB', 'CCC')]
+    batch = compute_universe_metrics(book, market_data, 'SPY')
+    for inst in book:
+        single = compute_all_metrics(inst, market_data, 'SPY')
+        assert batch[inst.symbol].keys() == single.keys()
+        for key in ('volatility', 'beta', 'max_drawdown'):
+            assert np.isclose(batch[inst.symbol][key], single[key])
+
+def test_universe_beta_aligns_on_timestamps():
+    market_data = _make_market_data()
+    gappy = market_data[~((market_data['symbol'] == 'AAA') & (market_data['timestamp'].dt.day % 3 == 0))]
+    m = compute_universe_metrics([Instrument('AAA', 1, 1)], gappy, 'SPY')['AAA']
+
+    wide = gappy.pivot(index='timestamp', columns='symbol', values='price')
+    aaa = wide['AAA'].dropna()
+    assert np.isclose(m['volatility'], aaa.pct_change().dropna().std())
+    shared = wide[['AAA', 'SPY']].dropna().pct_change().dropna()  # both legs over the same intervals
+    assert np.isclose(m['beta'], np.cov(shared['AAA'], shared['SPY'])[0, 1] / shared['SPY'].var())
+    assert np.isclose(m['max_drawdown'], ((aaa - aaa.cummax()) / aaa.cummax()).min())
+
+def test_universe_metrics_reject_duplicate_symbols():
+    with pytest.raises(ValueError, match="duplicate instrument symbols"):
+        compute_universe_metrics([Instrument('AAA', 1, 1), Instrument('AAA', 2, 2)], _make_market_data(), 'SPY')
@@ -0,0 +1,56 @@
+import random
+import pandas as pd
+import pytest
+from src.composite import Position, PortfolioGroup
+
+def _full_value(group):
+    return sum(_full_value(c) if isinstance(c, PortfolioGroup) else c.quantity * c.price for c in group.children)
+
+def _make_tree():
+    root, sub, leaf = PortfolioGroup("root"), PortfolioGroup("sub"), PortfolioGroup("leaf")
+    root.add(Position("AAA", 10, 100.0))
+    sub.add(Position("BBB", 5, 20.0))
+    leaf.add(Position("AAA", 2, 100.0))
+    leaf.add(Position("CCC", 1, 7.0))
+    sub.add(leaf)
+    root.add(sub)
+    return root, sub, leaf
+
+def test_position_updates_patch_cached_ancestors():
+    root, sub, leaf = _make_tree()
+    assert root.get_value() == 1000 + 100 + 200 + 7
+    ccc = leaf.children[1]
+    ccc.price = 9.0
+    ccc.quantity = 3
+    assert not root._dirty
+    assert root.get_value() == _full_value(root) == 1000 + 100 + 200 + 27
+    assert leaf.get_value() == 227
+
+def test_random_updates_stay_consistent():
+    rng = random.Random(0)
+    root, sub, leaf = _make_tree()
+    positions = [root.children[0], sub.children[0], *leaf.children]
+    root.get_value()
+    for _ in range(500):
+        pos = rng.choice(positions)
+        pos.price = rng.uniform(1, 200)
+        if rng.random() < 0.1:
+            sub.add(Position("DDD", 1, rng.uniform(1, 10)))
+        assert abs(root.get_value() - _full_value(root)) < 1e-6
+
+def test_bulk_reprice_by_symbol():
+    root, sub, leaf = _make_tree()
+    root.get_value()
+    n = root.reprice(pd.Series({"AAA": 50.0, "ZZZ": 1.0}))
+    assert n == 2
+    assert not root._dirty and not leaf._dirty  # patched with deltas, nothing re-summed
+    assert root.get_value() == 500 + 100 + 100 + 7
+    assert sub.reprice({"BBB": 10.0}) == 1
+    assert root.get_value() == 500 + 50 + 100 + 7
+
+def test_component_belongs_to_one_group():
+    root, sub, leaf = _make_tree()
+    with pytest.raises(ValueError, match="already belongs to leaf"):
+        root.add(leaf.children[0])
+    with pytest.raises(ValueError, match="already belongs to root"):
+        PortfolioGroup("other").add(sub)
@@ -0,0 +1,22 @@
+# tests/conftest.py
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+def _write_market_csv(path, n_symbols=6, n_ticks=60, seed=0):
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1, 9, 30)
+    prices = {f"S{i}": 100.0 for i in range(n_symbols)}
+    lines = ["timestamp,symbol,price,volume"]
+    for t in range(n_ticks):
+        for sym in prices:
+            prices[sym] *= 1 + rng.gauss(0, 0.01)
+            lines.append(f"{(base + timedelta(minutes=t)).isoformat()},{sym},{prices[sym]:.4f},100")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+@pytest.fixture
+def write_market_csv():
+    """Writes a random-walk timestamp,symbol,price,volume CSV: write_market_csv(path, n_symbols, n_ticks, seed)."""
+    return _write_market_csv
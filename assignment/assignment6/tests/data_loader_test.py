@@ -0,0 +1,78 @@
+import json
+import math
+import xml.etree.ElementTree as ET
+from src.data_loader import YahooFinanceAdapter, BloombergXMLAdapter, iter_json_object
+
+def _write_yahoo(path, n=50):
+    data = {f"S{i}": {"ts": f"2025-10-01T09:{i % 60:02d}:00", "price": 100.0 + i, "volume": None if i % 7 == 0 else 1000 + i}
+            for i in range(n)}
+    path.write_text(json.dumps(data, indent=2))
+    return data
+
+def _write_bloomberg(path, n=50):
+    rows = []
+    for i in range(n):
+        fields = f'<field name="PX_LAST">{100.0 + i}</field><field name="TIME">2025-10-01T09:30:00</field>'
+        if i % 5:
+            fields += f'<field name="VOLUME">{i}</field>'
+        rows.append(f'<security symbol="S{i}">{fields}</security>')
+    rows.append('<security symbol="S0"><field name="PX_LAST">1.0</field></security>')  # duplicate, first wins
+    path.write_text("<response><securities>" + "".join(rows) + "</securities></response>")
+
+def test_iter_json_object_with_small_chunks(tmp_path):
+    path = tmp_path / "yahoo.json"
+    data = _write_yahoo(path)
+    assert dict(iter_json_object(path, chunk_size=7)) == data
+
+def test_yahoo_streaming_matches_full_load(tmp_path):
+    path = tmp_path / "yahoo.json"
+    _write_yahoo(path)
+    full, streamed = YahooFinanceAdapter(path, stream=False), YahooFinanceAdapter(path, stream=True)
+    for sym in ("S0", "S3", "S49"):
+        assert full.get_data(sym) == streamed.get_data(sym)
+    assert full.get_data("S3").price == 103.0
+    assert streamed.get_data("NOPE") is None
+
+def test_bloomberg_index_and_get_many(tmp_path):
+    path = tmp_path / "bbg.xml"
+    _write_bloomberg(path)
+    adapter = BloombergXMLAdapter(path)
+    assert adapter.get_data("S0").price == 100.0
+    assert adapter.get_data("S6").volume == 6.0
+
+    batch = adapter.get_many(["S2", "NOPE", "S5"])
+    assert batch.symbols == ["S2", "S5"] and batch.missing == ["NOPE"]
+    assert batch.prices.tolist() == [102.0, 105.0]
+    assert batch.volumes[0] == 2.0 and math.isnan(batch.volumes[1])
+    assert [p.volume for p in batch.points()] == [2.0, None]
+    assert batch.points()[0] == adapter.get_data("S2")
+
+def test_malformed_records_are_skipped_and_reported(tmp_path):
+    yahoo = tmp_path / "yahoo.json"
+    yahoo.write_text(json.dumps({"AAA": {"price": 1.0}, "BBB": {"ts": "2025-10-01T09:30:00", "price": 2.0},
+                                 "CCC": {"ts": "yesterday", "price": 3.0}, "DDD": 7}))
+    for stream in (False, True):
+        adapter = YahooFinanceAdapter(yahoo, stream=stream)
+        assert adapter.get_many(["AAA", "BBB", "CCC"]).symbols == ["BBB"]
+        assert [sym for sym, _ in adapter.bad_records] == ["AAA", "CCC", "DDD"]
+
+    bbg = tmp_path / "bbg.xml"
+    bbg.write_text('<response><securities><security symbol="A"><field name="PX_LAST">n/a</field></security>'
+                   '<security><field name="PX_LAST">1</field></security>'
+                   '<security symbol="B"><field name="PX_LAST">2</field></security></securities></response>')
+    adapter = BloombergXMLAdapter(bbg)
+    assert adapter.symbols == ["B"] and len(adapter.bad_records) == 2
+
+def test_bloomberg_parse_detaches_processed_securities(tmp_path, monkeypatch):
+    path = tmp_path / "bbg.xml"
+    _write_bloomberg(path, n=200)
+    seen = []
+    real_iterparse = ET.iterparse
+    def spying_iterparse(*args, **kwargs):
+        for event, elem in real_iterparse(*args, **kwargs):
+            if event == "end" and elem.tag == "securities":
+                seen.append(len(elem))
+            yield event, elem
+    monkeypatch.setattr(ET, "iterparse", spying_iterparse)
+    assert len(BloombergXMLAdapter(path).symbols) == 200
+    assert seen == [0]  # every security was removed from its parent once read
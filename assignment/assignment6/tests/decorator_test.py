@@ -1,5 +1,6 @@
 import pandas as pd
-from src.decorator import Instrument, VolatilityDecorator, BetaDecorator, DrawdownDecorator
+from src.decorator import (Instrument, VolatilityDecorator, BetaDecorator, DrawdownDecorator,
+                           market_index, bump_data_version)
 
 def _make_fake_market_data():
     data = {
@@ -40,3 +41,29 @@ def test_full_stack_of_decorators():
     full = DrawdownDecorator(BetaDecorator(VolatilityDecorator(inst, market_data), market_data, 'SPY'), market_data)
     m = full.get_metrics()
     assert all(k in m for k in ['volatility','beta','max_drawdown'])
+
+def test_market_index_is_shared_and_matches_filter_sort():
+    market_data = _make_fake_market_data().sample(frac=1.0, random_state=0)  # unsorted input
+    idx = market_index(market_data)
+    assert market_index(market_data) is idx
+    for sym in ('AAPL', 'SPY'):
+        expected = market_data[market_data['symbol'] == sym].sort_values('timestamp')['price']
+        assert idx.price_history(sym).tolist() == expected.tolist()
+        assert idx.returns(sym) is idx.returns(sym)
+    assert idx.price_history('MSFT').empty
+
+def test_calculate_vol_still_takes_prices():
+    market_data = _make_fake_market_data()
+    deco = VolatilityDecorator(Instrument('AAPL', 100, 10), market_data)
+    prices = market_data[market_data['symbol'] == 'AAPL']['price']
+    assert deco._calculate_vol(prices) == deco.get_metrics()['volatility']
+
+def test_market_index_rebuilt_after_version_bump():
+    market_data = _make_fake_market_data()
+    idx = market_index(market_data)
+    market_data.loc[market_data['symbol'] == 'AAPL', 'price'] = 50.0
+    bump_data_version(market_data)
+    rebuilt = market_index(market_data)
+    assert rebuilt is not idx
+    assert rebuilt.price_history('AAPL').tolist() == [50.0] * 5
+    assert VolatilityDecorator(Instrument('AAPL', 50, 1), market_data).get_metrics()['volatility'] == 0.0
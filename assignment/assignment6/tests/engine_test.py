@@ -0,0 +1,74 @@
+
+import pytest
+import src.engine as engine
+from src.engine import run_engine
+from src.patterns.strategy import MeanReversionStrategy, BreakoutStrategy
+from src.patterns.observer import SignalPublisher, LoggerObserver
+from src.patterns.command import CommandInvoker, CommandJournal, replay_journal
+
+def test_sharded_run_matches_single_process(tmp_path, write_market_csv):
+    csv_path = write_market_csv(tmp_path / "market_data.csv")
+
+    serial_logs, sharded_logs = [], []
+    serial_pub, sharded_pub = SignalPublisher(), SignalPublisher()
+    serial_pub.attach(LoggerObserver(log_fn=serial_logs.append))
+    sharded_pub.attach(LoggerObserver(log_fn=sharded_logs.append))
+
+    serial = run_engine(csv_path, publisher=serial_pub)
+    strategies = [MeanReversionStrategy(window=5, k=1.0, qty=10), BreakoutStrategy(lookback=3, qty=5)]
+    sharded = run_engine(csv_path, strategies=strategies, publisher=sharded_pub, workers=3)
+
+    assert len(serial.trades) > 0
+    assert sharded.trades == serial.trades
+    assert sharded.positions == serial.positions
+    assert abs(sharded.cash - serial.cash) < 1e-6  # shards sum their own cash flows
+    assert sharded_logs == serial_logs
+    assert not strategies[0].stats and not strategies[1].highs  # workers ran on copies
+
+def test_resume_from_checkpoint_matches_uninterrupted_run(tmp_path, monkeypatch, write_market_csv):
+    csv_path = write_market_csv(tmp_path / "market_data.csv", n_ticks=80)
+    full = run_engine(csv_path)
+
+    calls = {"n": 0}
+    real_row_to_tick = engine.row_to_tick
+    def crashing_row_to_tick(row):
+        calls["n"] += 1
+        if calls["n"] == 230:
+            raise RuntimeError("crash")
+        return real_row_to_tick(row)
+
+    ckpt = tmp_path / "engine.ckpt"
+    monkeypatch.setattr(engine, "row_to_tick", crashing_row_to_tick)
+    with pytest.raises(RuntimeError):
+        run_engine(csv_path, checkpoint_path=ckpt, checkpoint_every=100)
+    monkeypatch.undo()
+    state = engine.load_checkpoint(ckpt)
+    assert state["rows"] == 200 and "trades" not in state and "ctx" not in state
+
+    with pytest.raises(ValueError, match="checkpoint was taken on"):
+        run_engine(write_market_csv(tmp_path / "other.csv", n_ticks=80), resume_from=ckpt)
+
+    resumed = run_engine(csv_path, resume_from=ckpt, checkpoint_path=ckpt)
+    assert 0 < len(resumed.trades) < len(full.trades)
+    assert resumed.trades == full.trades[-len(resumed.trades):]  # only what ran after the checkpoint
+    assert resumed.positions == full.positions
+    assert abs(resumed.cash - full.cash) < 1e-9
+
+def test_long_run_keeps_undo_history_bounded_and_journals(tmp_path, monkeypatch, write_market_csv):
+    csv_path = write_market_csv(tmp_path / "market_data.csv", n_ticks=400)
+    invokers = []
+    class Recording(CommandInvoker):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            invokers.append(self)
+    monkeypatch.setattr("src.engine.CommandInvoker", Recording)
+
+    full = run_engine(csv_path)
+    with CommandJournal(tmp_path / "orders.journal") as journal:
+        lean = run_engine(csv_path, max_undo=16, journal=journal, record_trades=False)
+
+    assert len(invokers[0]._undo_stack) == 1_000 < len(full.trades)  # default bound
+    assert len(invokers[1]._undo_stack) == 16
+    assert lean.trades == [] and lean.positions == full.positions
+    rebuilt = replay_journal(tmp_path / "orders.journal", cash=100_000.0)
+    assert rebuilt.positions == full.positions and abs(rebuilt.cash - full.cash) < 1e-6
@@ -0,0 +1,56 @@
+# Import-time budgets: `python -X importtime` in a fresh interpreter per module.
+# Each budget is a multiple of a bare `python -c pass` measured in the same run,
+# so a slow or busy machine slows both sides alike.
+# Run this file directly for a report of the slowest imports.
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BUDGETS = json.loads((Path(__file__).parent / "import_budgets.json").read_text())
+
+def _split(key: str):
+    """Budget keys are `module` (run from the assignment6 root) or `dir:module`, dir relative to it."""
+    where, _, module = key.rpartition(":")
+    return (ROOT / where).resolve(), module
+
+def importtime(code: str, cwd: Path = ROOT):
+    """(wall ms, {imported module: cumulative microseconds}) for running `code` in a new process."""
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                         cwd=cwd, capture_output=True, text=True, check=True).stderr
+    wall_ms = (time.perf_counter() - start) * 1000
+    times = {}
+    for line in out.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return wall_ms, times
+
+@pytest.fixture(scope="module")
+def bare_ms():
+    return min(importtime("pass")[0] for _ in range(5))
+
+@pytest.mark.parametrize("key", sorted(BUDGETS))
+def test_import_budget(key, bare_ms):
+    budget = BUDGETS[key]
+    cwd, module = _split(key)
+    wall_ms, times = min((importtime(f"import {module}", cwd) for _ in range(3)), key=lambda run: run[0])
+    heavy = [m for m in budget["forbidden"] if m in times]
+    assert not heavy, f"{key} imports {heavy} eagerly"
+    assert wall_ms <= budget["max_x"] * bare_ms, f"{key}: {wall_ms:.0f} ms vs {bare_ms:.0f} ms bare interpreter"
+
+if __name__ == "__main__":
+    bare = min(importtime("pass")[0] for _ in range(5))
+    print(f"bare interpreter: {bare:.1f} ms")
+    for key in sorted(BUDGETS):
+        cwd, module = _split(key)
+        wall_ms, times = importtime(f"import {module}", cwd)
+        print(f"{key}: {wall_ms:.1f} ms = {wall_ms / bare:.1f}x (budget {BUDGETS[key]['max_x']}x)")
+        for name, us in sorted(times.items(), key=lambda kv: -kv[1])[1:6]:
+            print(f"    {name:<40} {us / 1000:8.1f} ms")
@@ -0,0 +1,81 @@
+import random
+import statistics
+import numpy as np
+import pandas as pd
+from src.indicators import RollingStats, RollingMax, RollingMin, RollingMedian, EWMA, Momentum, rolling_quantile
+
+def test_rolling_stats_matches_window_recompute():
+    rng = random.Random(7)
+    rs = RollingStats(window=10, resync_every=37)
+    xs = []
+    for _ in range(500):
+        x = 1e6 + rng.gauss(0, 1)
+        rs.add(x)
+        xs.append(x)
+        w = xs[-10:]
+        assert abs(rs.mean - statistics.fmean(w)) < 1e-6
+        if len(w) > 1:
+            assert abs(rs.std - statistics.pstdev(w)) < 1e-6
+    assert rs.ready
+
+def test_rolling_stats_constant_series_has_zero_std():
+    rs = RollingStats(window=5)
+    for _ in range(50):
+        rs.add(100.0)
+    assert rs.std == 0.0
+
+def test_rolling_min_max_track_window():
+    rng = random.Random(1)
+    hi, lo = RollingMax(4), RollingMin(4)
+    xs = []
+    for _ in range(200):
+        x = rng.randint(0, 20)
+        hi.add(x)
+        lo.add(x)
+        xs.append(x)
+        assert hi.value == max(xs[-4:])
+        assert lo.value == min(xs[-4:])
+
+def test_ewma_and_momentum():
+    e = EWMA(span=3)
+    for x in [1, 2, 3]:
+        e.add(x)
+    assert e.value == 1 + 0.5 * (2 - 1) + 0.5 * (3 - 1.5)
+
+    m = Momentum(2)
+    for x in [10, 11]:
+        m.add(x)
+    assert not m.ready
+    m.add(13)
+    assert m.value == 3
+    assert abs(m.ret - 0.3) < 1e-12
+
+def test_rolling_quantile_matches_pandas():
+    rng = np.random.default_rng(3)
+    x = rng.integers(0, 5, size=400).astype(float)  # plenty of ties
+    for w, q in [(1, 0.5), (4, 0.0), (7, 0.25), (10, 0.5), (15, 0.9)]:
+        expected = pd.Series(x).rolling(w).quantile(q).to_numpy()
+        assert np.allclose(rolling_quantile(x, w, q), expected, equal_nan=True)
+
+    panel = rng.normal(size=(120, 3))
+    expected = pd.DataFrame(panel).rolling(9).median().to_numpy()
+    assert np.allclose(rolling_quantile(panel, 9), expected, equal_nan=True)
+
+def test_rolling_quantile_skips_nan_like_pandas():
+    rng = np.random.default_rng(5)
+    panel = 100 * np.cumprod(1 + rng.normal(0, 0.01, size=(200, 3)), axis=0)
+    returns = pd.DataFrame(panel).pct_change()  # leading NaN row, as in a return panel
+    returns.iloc[50:53, 1] = np.nan
+    returns.iloc[::17, 2] = np.nan
+    for w, q, mp in [(9, 0.5, None), (9, 0.25, 5), (1, 0.9, None)]:
+        expected = returns.rolling(w, min_periods=mp).quantile(q).to_numpy()
+        assert np.allclose(rolling_quantile(returns.to_numpy(), w, q, min_periods=mp), expected, equal_nan=True)
+    assert np.isnan(rolling_quantile(np.full(5, np.nan), 3)).all()
+
+def test_rolling_median_incremental():
+    rm = RollingMedian(3)
+    out = []
+    for x in [5, 1, 3, 10, 2]:
+        rm.add(x)
+        out.append(rm.value)
+    assert out == [5, 3, 3, 3, 3]
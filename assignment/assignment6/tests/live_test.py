@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from src.engine import run_engine, load_ticks_csv
+from src import live
+from src.live import SimulatedFeedServer, iter_source, run_live, socket_source
+from src.patterns.command import CommandInvoker, CommandJournal, read_journal
+from src.patterns.observer import SignalPublisher, LoggerObserver
+
+def test_live_merge_of_feed_servers_matches_csv_engine(tmp_path, write_market_csv):
+    csv_path = write_market_csv(tmp_path / "market_data.csv", n_symbols=4, n_ticks=50)
+    ticks = list(load_ticks_csv(csv_path))
+    feeds = [[t for t in ticks if t.symbol in group] for group in (("S0", "S1"), ("S2",), ("S3",))]  # ties resolve by source order
+
+    expected_logs, live_logs = [], []
+    pub = SignalPublisher()
+    pub.attach(LoggerObserver(log_fn=expected_logs.append))
+    expected = run_engine(csv_path, publisher=pub)
+
+    async def main():
+        servers = [await SimulatedFeedServer(feed).start() for feed in feeds]
+        try:
+            live_pub = SignalPublisher()
+            live_pub.attach(LoggerObserver(log_fn=live_logs.append))
+            sources = [socket_source(s.host, s.port) for s in servers]
+            return await run_live(sources, publisher=live_pub, max_queue=4)
+        finally:
+            for s in servers:
+                await s.stop()
+
+    ctx = asyncio.run(main())
+    assert len(expected.trades) > 0
+    assert ctx.trades == expected.trades
+    assert ctx.positions == expected.positions
+    assert live_logs == expected_logs
+
+def test_live_sources_are_bounded_by_max_queue(tmp_path, write_market_csv):
+    ticks = list(load_ticks_csv(write_market_csv(tmp_path / "m.csv", n_symbols=1, n_ticks=30)))
+    produced = []
+    consumed = []
+
+    async def counting(src):
+        for t in src:
+            produced.append(t)
+            yield t
+
+    class Probe:
+        def generate_signals(self, tick):
+            consumed.append(tick)
+            assert len(produced) - len(consumed) <= 3 + 1  # queue + one in flight
+            return []
+
+    async def main():
+        return await run_live([counting(ticks), iter_source([])], strategies=[Probe()], max_queue=3)
+
+    asyncio.run(main())
+    assert consumed == ticks
+
+def test_failing_source_stops_the_merge_at_once(tmp_path, write_market_csv):
+    ticks = list(load_ticks_csv(write_market_csv(tmp_path / "m.csv", n_symbols=1, n_ticks=5)))
+    stalled = asyncio.Event()
+
+    async def broken():
+        yield ticks[0]
+        raise ConnectionError("feed dropped")
+
+    async def slow():
+        for t in ticks:
+            yield t
+        await stalled.wait()  # never finishes on its own
+        yield ticks[-1]
+
+    async def main():  # without fail-fast the merge would wait on slow() until the timeout
+        return await asyncio.wait_for(run_live([slow(), broken()]), timeout=5)
+
+    with pytest.raises(ConnectionError, match="feed dropped"):
+        asyncio.run(main())
+
+def test_live_undo_history_is_bounded(tmp_path, write_market_csv, monkeypatch):
+    ticks = list(load_ticks_csv(write_market_csv(tmp_path / "m.csv", n_symbols=2, n_ticks=200)))
+    invokers = []
+
+    class RecordingInvoker(CommandInvoker):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            invokers.append(self)
+
+    monkeypatch.setattr(live, "CommandInvoker", RecordingInvoker)
+    with CommandJournal(tmp_path / "orders.journal") as journal:
+        ctx = asyncio.run(run_live([iter_source(ticks)], max_undo=5, journal=journal, record_trades=False))
+    (inv,) = invokers
+    assert len(inv._undo_stack) == 5
+    assert ctx.trades == [] and ctx.positions
+    records, _ = read_journal(tmp_path / "orders.journal")
+    assert len(records) > 5  # the journal keeps what the bounded undo history drops
@@ -1,7 +1,13 @@
 # tests/observer_command_test.py
+import threading
 from datetime import datetime
-from src.patterns.strategy import SignalPublisher, LoggerObserver, AlertObserver
-from src.patterns.command import ExecutionContext, ExecuteOrderCommand, CommandInvoker
+
+import pytest
+from src.patterns.observer import (SignalPublisher, AsyncSignalPublisher, Observer, LoggerObserver, AlertObserver,
+                                   ColumnarSignalSink, load_signals)
+from src.patterns.strategy import Signal
+from src.patterns.command import (ExecutionContext, ExecuteOrderCommand, BatchOrderCommand, CommandInvoker,
+                                  CommandJournal, replay_journal, read_journal)
 
 def test_observer_notifications():
     logs = []
@@ -58,4 +64,254 @@ def test_command_execute_and_undo_logic():
 
     inv.redo()
     assert ctx.positions["XYZ"] == 100
-    assert ctx.cash == 100000.0 - 100 * 50.0
\ No newline at end of file
+    assert ctx.cash == 100000.0 - 100 * 50.0
+
+def test_lowercase_action_books_as_buy():
+    ctx = ExecutionContext(cash=1_000.0)
+    ExecuteOrderCommand(ctx, Signal("ORDER", "buy", "XYZ", 2, 10.0, "T1", "Demo")).execute()
+    ExecuteOrderCommand(ctx, {"action": "buy", "symbol": "XYZ", "qty": 1, "price": 10.0}).execute()
+    assert ctx.positions["XYZ"] == 3
+    assert ctx.cash == 1_000.0 - 30.0
+    assert [sig.action for _, sig in ctx.trades] == ["BUY", "BUY"]
+
+def _order(i):
+    return {"type": "ORDER", "strategy": "Demo", "action": "BUY", "qty": 1,
+            "symbol": "AAA", "price": 10.0 + i, "ts": i, "reason": "demo"}
+
+def test_async_publisher_delivers_in_order():
+    logs = []
+    with AsyncSignalPublisher(batch_size=8) as pub:
+        pub.attach(LoggerObserver(log_fn=logs.append))
+        for i in range(100):
+            pub.notify(_order(i))
+        assert pub.flush(timeout=5)
+        m = pub.metrics()
+    assert len(logs) == 100
+    assert logs[0].startswith("[LOG] 0 |") and logs[-1].startswith("[LOG] 99 |")
+    assert m["delivered"] == 100 and m["dropped"] == 0 and m["queue_depth"] == 0
+
+def test_async_publisher_overflow_policies():
+    gate, started = threading.Event(), threading.Event()
+
+    class Slow(Observer):
+        def __init__(self):
+            self.seen = []
+        def update(self, signal):
+            started.set()
+            gate.wait(5)
+            self.seen.append(signal["ts"])
+
+    for policy in ("drop_oldest", "sample"):
+        gate.clear()
+        started.clear()
+        slow = Slow()
+        pub = AsyncSignalPublisher(max_queue=4, batch_size=1, overflow=policy, sample_every=2)
+        pub.attach(slow)
+        pub.notify(_order(0))
+        assert started.wait(5)  # dispatcher has taken signal 0 and is stuck in the observer
+        for i in range(1, 11):
+            pub.notify(_order(i))
+        assert pub.queue_depth == 4
+        gate.set()
+        pub.close()
+        if policy == "drop_oldest":
+            assert slow.seen == [0, 7, 8, 9, 10]
+            assert pub.dropped == 6
+        else:
+            assert slow.seen == [0, 4, 6, 8, 10]  # every 2nd overflowing arrival replaces the oldest
+            assert pub.dropped == 6
+
+def test_async_publisher_rejects_bad_policy():
+    with pytest.raises(ValueError):
+        AsyncSignalPublisher(overflow="spill")
+
+def test_journal_replay_rebuilds_context(tmp_path):
+    path = tmp_path / "orders.journal"
+    ctx = ExecutionContext(cash=100_000.0, record_trades=False)
+    with CommandJournal(path, flush_every=3, initial_records=2) as journal:
+        inv = CommandInvoker(max_undo=2, journal=journal)
+        for i in range(10):
+            side = "BUY" if i % 3 else "SELL"
+            sym = "AAA" if i % 2 else "BBB"
+            inv.execute(ExecuteOrderCommand(ctx, {"action": side, "symbol": sym, "qty": 10 + i,
+                                                  "price": 50.0 + i, "ts": datetime(2025, 1, 1)}))
+        inv.undo()
+        inv.undo()
+        assert inv.undo() is None  # only the last two commands are kept in memory
+        inv.redo()
+    assert ctx.trades == []
+
+    records, symbols = read_journal(path)
+    assert len(records) == 13 and symbols == ["BBB", "AAA"]
+    rebuilt = replay_journal(path, cash=100_000.0)
+    assert abs(rebuilt.cash - ctx.cash) < 1e-9
+    assert rebuilt.positions == ctx.positions
+
+    # reopening appends after the committed records
+    with CommandJournal(path) as journal:
+        CommandInvoker(journal=journal).execute(
+            ExecuteOrderCommand(ctx, {"action": "BUY", "symbol": "CCC", "qty": 1, "price": 2.0}))
+    assert replay_journal(path, cash=100_000.0).positions == ctx.positions
+
+def _sink_signals(n):
+    return [Signal("ORDER", "BUY" if i % 3 else "SELL", f"S{i % 5}", i, 100.0 + i, datetime(2025, 1, 1, 9, 30, i % 60),
+                   "MR" if i % 2 else "BO", f"r{i}") for i in range(n)]
+
+def test_columnar_sink_chunks_rotates_and_reads_back(tmp_path):
+    signals = _sink_signals(23)
+    with ColumnarSignalSink(tmp_path, fmt="npz", chunk_size=4, max_bytes=1, include_reason=True) as sink:
+        pub = SignalPublisher()
+        pub.attach(sink)
+        for sig in signals:
+            pub.notify(sig)
+    assert sink.rows_written == 23
+    assert len(sink.files) == 6  # every chunk exceeds max_bytes, so each gets its own file
+
+    df = load_signals(sink.files)
+    assert df["symbol"].tolist() == [s["symbol"] for s in signals]
+    assert df["action"].tolist() == [s["action"] for s in signals]
+    assert df["price"].tolist() == [s["price"] for s in signals]
+    assert df["reason"].tolist() == [s["reason"] for s in signals]
+    assert list(df["ts"]) == [s["ts"] for s in signals]
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_columnar_sink_arrow_roundtrip(tmp_path, fmt):
+    pytest.importorskip("pyarrow")
+    signals = _sink_signals(10)
+    with ColumnarSignalSink(tmp_path, fmt=fmt, chunk_size=3) as sink:
+        sink.update_batch(signals)
+    assert [p.suffix for p in sink.files] == [f".{fmt}"]
+    df = load_signals(sink.files)
+    assert df["symbol"].astype(str).tolist() == [s.symbol for s in signals]
+    assert df["qty"].tolist() == [s.qty for s in signals]
+    assert list(df["ts"]) == [s.ts for s in signals]
+
+def test_columnar_sink_rejects_bad_ts_and_use_after_close(tmp_path):
+    sink = ColumnarSignalSink(tmp_path, fmt="npz", chunk_size=4)
+    good, bad = _sink_signals(2)
+    bad.ts = 12.5
+    with pytest.raises(TypeError, match="signal ts"):
+        sink.update(bad)
+    sink.update(Signal("ORDER", "BUY", "S0", 1, 1.0, "2025-01-01T09:30:00+01:00", "MR"))
+    sink.update(good)
+    sink.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        sink.update(good)
+    with pytest.raises(RuntimeError, match="closed"):
+        sink.flush()
+    df = load_signals(sink.files)
+    assert list(df["ts"]) == [datetime(2025, 1, 1, 8, 30), good.ts]  # converted to naive UTC
+
+def test_topic_routing_delivers_only_matching_signals():
+    class Collect(Observer):
+        def __init__(self):
+            self.seen = []
+        def update(self, signal):
+            self.seen.append((signal["symbol"], signal["action"]))
+
+    pub = SignalPublisher()
+    everything, aaa, mr_buys = Collect(), Collect(), Collect()
+    pub.attach(everything)
+    pub.attach(aaa, symbol="AAA")
+    pub.attach(mr_buys, strategy="MR", action=["BUY"], type="ORDER")
+    alerts = []
+    alert = AlertObserver(notional_threshold=0, alert_fn=alerts.append)
+    pub.attach(alert)  # defaults to its own topics: ORDER only
+
+    sigs = [
+        {"type": "ORDER", "symbol": "AAA", "strategy": "MR", "action": "BUY", "qty": 1, "price": 1.0},
+        {"type": "ORDER", "symbol": "BBB", "strategy": "MR", "action": "SELL", "qty": 1, "price": 1.0},
+        {"type": "INFO", "symbol": "AAA", "strategy": "MR", "action": "BUY"},
+        {"type": "ORDER", "symbol": "BBB", "strategy": "BO", "action": "BUY", "qty": 1, "price": 1.0},
+    ]
+    for s in sigs:
+        pub.notify(s)
+    assert len(everything.seen) == 4
+    assert aaa.seen == [("AAA", "BUY"), ("AAA", "BUY")]
+    assert mr_buys.seen == [("AAA", "BUY")]
+    assert len(alerts) == 3
+    assert pub.subscribers(sigs[2]) == (everything, aaa)
+
+    pub.attach(aaa, symbol="BBB")  # re-attach replaces the filter
+    pub.detach(everything)
+    assert pub.subscribers(sigs[1]) == (aaa, alert)
+
+def test_routing_survives_unhashable_fields_and_topics_are_frozen():
+    seen, filtered = [], []
+    class Collect(Observer):
+        def __init__(self, out):
+            self.out = out
+        def update(self, signal):
+            self.out.append(signal.symbol)
+
+    pub = SignalPublisher()
+    pub.attach(Collect(seen))
+    pub.attach(Collect(filtered), symbol="AAA")
+    pub.notify({"type": "ORDER", "symbol": ["AAA"], "action": "BUY"})  # a list is unhashable
+    assert seen == [["AAA"]] and filtered == []
+
+    with pytest.raises(TypeError):
+        AlertObserver.topics["type"] = "INFO"
+    assert Observer.topics is None
+
+def test_async_publisher_routes_batches():
+    class Batch(Observer):
+        def __init__(self):
+            self.seen = []
+        def update(self, signal):
+            self.seen.append(signal["symbol"])
+        def update_batch(self, signals):
+            self.seen.extend(s["symbol"] for s in signals)
+
+    only_b, all_ = Batch(), Batch()
+    with AsyncSignalPublisher(batch_size=8) as pub:
+        pub.attach(only_b, symbol={"B"})
+        pub.attach(all_)
+        for sym in "ABABBA":
+            pub.notify({"type": "ORDER", "symbol": sym})
+        pub.flush()
+        routes = pub._routes
+        assert len(routes) == 2  # the dispatcher filled the publisher's own routing table
+        pub.notify({"type": "ORDER", "symbol": "A"})
+        pub.flush()
+        assert pub._routes is routes
+        pub.detach(all_)
+        assert pub._routes is not routes and not pub._routes
+    assert only_b.seen == ["B", "B", "B"]
+    assert all_.seen == list("ABABBAA")
+
+def test_batch_order_command_matches_individual_orders_and_undoes_as_one():
+    orders = [{"action": "BUY", "symbol": "AAA", "qty": 10, "price": 50.0},
+              {"action": "SELL", "symbol": "BBB", "qty": 4, "price": 20.0},
+              {"action": "SELL", "symbol": "AAA", "qty": 3, "price": 51.0}]
+    one_by_one = ExecutionContext(cash=1_000.0)
+    for o in orders:
+        ExecuteOrderCommand(one_by_one, o).execute()
+
+    ctx = ExecutionContext(cash=1_000.0)
+    inv = CommandInvoker()
+    inv.execute(BatchOrderCommand(ctx, orders))
+    assert ctx.positions == one_by_one.positions == {"AAA": 7.0, "BBB": -4.0}
+    assert ctx.cash == one_by_one.cash
+    assert ctx.trades == one_by_one.trades
+
+    inv.undo()
+    assert ctx.positions == {"AAA": 0.0, "BBB": 0.0} and ctx.cash == 1_000.0
+    assert inv.undo() is None  # the whole tick was a single undo entry
+
+    with pytest.raises(KeyError):
+        BatchOrderCommand(ctx, orders + [{"action": "BUY", "qty": 1}])  # rejected before anything is applied
+    assert ctx.cash == 1_000.0
+
+def test_batch_order_command_is_atomic_and_copies_its_orders():
+    ctx = ExecutionContext(cash=1_000.0)
+    bad = [Signal("ORDER", "BUY", "AAA", 10, 5.0, 1, "Demo"), Signal("ORDER", "BUY", "BBB", "ten", 5.0, 1, "Demo")]
+    with pytest.raises(ValueError):
+        CommandInvoker().execute(BatchOrderCommand(ctx, bad))
+    assert ctx.positions == {} and ctx.cash == 1_000.0 and ctx.trades == []
+
+    orders = bad[:1]
+    cmd = BatchOrderCommand(ctx, orders)
+    orders.append(bad[1])  # later changes to the caller's list do not leak into the command
+    cmd.execute()
+    assert ctx.positions == {"AAA": 10.0} and ctx.cash == 950.0
@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+import pytest
+from src.patterns.factory import InstrumentFactory, InstrumentRegistry, Bond
+
+DATA = Path(__file__).resolve().parents[1] / "data" / "instruments.csv"
+
+def test_registry_loads_instrument_master():
+    reg = InstrumentFactory.load_registry(DATA)
+    assert len(reg) == 4 and "AAPL" in reg
+    aapl = reg.get("AAPL")
+    assert (aapl.symbol, aapl.type, aapl.price, aapl.sector) == ("AAPL", "Stock", 172.35, "Technology")
+    assert aapl.maturity is None
+    assert not hasattr(aapl, "__dict__")
+    assert [v.symbol for v in reg.by_sector("Technology")] == ["AAPL", "MSFT"]
+    assert [v.symbol for v in reg.by_type("ETF")] == ["SPY"]
+    assert reg.by_sector("Energy") == []
+    assert reg.get("NOPE") is None
+
+    bond = reg.get("US10Y").to_instrument()
+    assert isinstance(bond, Bond) and bond.maturity == "2035-10-01"
+
+def test_registry_interns_symbols_and_rejects_bad_rows():
+    rows = [{"symbol": "".join(["A", "B"]), "type": "Stock", "price": "1", "sector": "X", "issuer": "I"}]
+    reg = InstrumentRegistry.from_rows(rows)
+    assert reg.symbols[0] is sys.intern("AB")
+    assert reg.id_of("AB") == 0 and reg.view(0) == reg.get("AB")
+    with pytest.raises(ValueError):
+        InstrumentRegistry.from_rows([{"symbol": "BTC", "type": "Crypto"}])
+    with pytest.raises(ValueError):
+        InstrumentRegistry.from_rows(rows * 2)
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
-from src.patterns.strategy import MarketDataPoint, MeanReversionStrategy, BreakoutStrategy
+from src.patterns.strategy import MarketDataPoint, MeanReversionStrategy, BreakoutStrategy, Signal
+from src.patterns.command import ExecutionContext, ExecuteOrderCommand
 
 def test_mean_reversion_buy_and_sell_signals():
     base = datetime(2024, 1, 1, 9, 30)
@@ -37,3 +38,34 @@ def test_breakout_strategy_triggers_on_high_and_low():
         assert s["strategy"] == "Breakout"
         assert s["symbol"] == "BBB"
         assert "Break" in s["reason"]
+
+def test_mean_reversion_median_center():
+    base = datetime(2024, 1, 1, 9, 30)
+    mr = MeanReversionStrategy(window=5, k=1.0, qty=10, center="median")
+
+    prices = [100, 100, 100, 100, 100, 95, 105]
+    signals = []
+    for i, px in enumerate(prices):
+        signals.extend(mr.generate_signals(MarketDataPoint("AAA", base + timedelta(minutes=i), px)))
+
+    assert [s["action"] for s in signals] == ["BUY", "SELL"]
+
+def test_signal_is_slotted_dict_compatible_and_lazy():
+    sig = Signal("ORDER", "BUY", "AAA", 10, 95.0, "T1", "MeanReversion", "z={:.2f}", (-2.345,))
+    assert not hasattr(sig, "__dict__")
+
+    ctx = ExecutionContext(cash=1_000.0)
+    ExecuteOrderCommand(ctx, sig).execute()
+    assert ctx.positions["AAA"] == 10 and ctx.cash == 1_000.0 - 950.0
+    assert ctx.trades == [("EXECUTE", sig)]
+    assert sig._reason_args is not None  # executing never formats the reason
+
+    assert sig["reason"] == "z=-2.35" and sig.reason == "z=-2.35"
+    assert sig.get("qty") == 10 and sig.get("missing", 1) == 1
+    assert dict(sig) == sig.to_dict() and set(sig) == set(Signal.FIELDS)
+
+def test_signal_from_mapping():
+    d = {"type": "ORDER", "action": "sell", "symbol": "AAA", "qty": 3, "price": 9.5, "reason": "demo"}
+    sig = Signal.from_mapping(d)
+    assert (sig.action, sig.qty, sig.price, sig.reason, sig.ts) == ("SELL", 3, 9.5, "demo", None)
+    assert Signal.from_mapping(sig) is sig
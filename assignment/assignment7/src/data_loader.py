@@ -1,11 +1,16 @@
-import tracemalloc
-import pandas as pd
-import polars as pl
+from __future__ import annotations
 
+import tracemalloc
 from time import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # imported on first use, so workers only load the library they need
+    import pandas as pd
+    import polars as pl
 
 def load_csv_with_pandas(path: str) -> pd.DataFrame:
     """Load a CSV file into a Pandas DataFrame."""
+    import pandas as pd
     df = pd.read_csv(path)
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     df = df.set_index('timestamp')
@@ -13,6 +18,7 @@ def load_csv_with_pandas(path: str) -> pd.DataFrame:
 
 def load_csv_with_polars(path: str) -> pl.DataFrame:
     """Load a CSV file into a Polars DataFrame."""
+    import polars as pl
     df = pl.read_csv(path)
     df = df.with_columns(
         pl.col('timestamp').str.strptime(pl.Datetime, "%Y-%m-%d %H:%M:%S")
@@ -1,7 +1,3 @@
-import pandas as pd
-import polars as pl
-import matplotlib.pyplot as plt
-
 from data_loader import *
 
 def Rolling_with_Pandas(path: str):
@@ -33,6 +29,7 @@ def Rolling_with_Pandas(path: str):
     return results
 
 def Rolling_with_Polars(path: str):
+    import polars as pl
     df = load_csv_with_polars(path)
     df = df.sort(['symbol', 'timestamp'])
     
@@ -57,6 +54,7 @@ def Rolling_with_Polars(path: str):
     
 def visualization(results_pandas, symbol="AAPL"):
     """Create a single figure with all metrics."""
+    import matplotlib.pyplot as plt
     data = results_pandas[symbol]
     
     fig, ax1 = plt.subplots(figsize=(14, 8))
@@ -1,17 +1,27 @@
+from __future__ import annotations
+
+import math
 import os
-import psutil
 import threading
 import tracemalloc
-import numpy as np
-import pandas as pd
-import polars as pl
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING
 
 from pathlib import Path
 from time import time, perf_counter
 from data_loader import load_csv_with_pandas, load_csv_with_polars
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
+# pandas/polars/psutil/matplotlib are imported where they are used: process-pool
+# workers and short CLI runs then only pay for the libraries they touch.
+if TYPE_CHECKING:
+    import pandas as pd
+    import polars as pl
+
+
+def _is_polars_frame(df) -> bool:
+    # avoids importing polars just to run an isinstance check on a pandas frame
+    return type(df).__module__.startswith("polars")
+
 
 # =========================================================
 # 1. POLARS: PREPARE WHOLE FRAME (show max strength)
@@ -22,6 +32,7 @@ def polars_prepare_full(df: pl.DataFrame, win: int = 20) -> pl.DataFrame:
     (rolling mean, rolling std on price, Sharpe on returns) in ONE expression.
     This is what polars is good at.
     """
+    import polars as pl
     return (
         df.sort(["symbol", "timestamp"])
         .with_columns(
@@ -41,7 +52,7 @@ def polars_prepare_full(df: pl.DataFrame, win: int = 20) -> pl.DataFrame:
             (
                 pl.col("ret").rolling_mean(win).over("symbol")
                 / pl.col("ret").rolling_std(win).over("symbol")
-                * np.sqrt(252)
+                * math.sqrt(252)
             ).alias("rolling_sharpe")
         )
     )
@@ -62,7 +73,7 @@ def Calculate_Metrics_for_Symbol_Pandas(df: pd.DataFrame, symbol: str):
     rolling_sharpe = (
         returns.rolling(window=20).mean()
         / returns.rolling(window=20).std()
-        * np.sqrt(252)
+        * math.sqrt(252)
     )
 
     return (
@@ -83,6 +94,7 @@ def Calculate_Metrics_for_Symbol_Polars(df: pl.DataFrame, symbol: str):
       because we ran `polars_prepare_full(...)` once in the rolling function.
     - That way we do NOT recompute per-symbol in Python — we just slice.
     """
+    import polars as pl
     symbol_df = df.filter(pl.col("symbol") == symbol)
 
     return (
@@ -104,7 +116,7 @@ def Rolling_Sequential(df, Metrics_Function):
     symbols = ["AAPL", "MSFT", "SPY"]
 
     # if it's polars + polars metrics: precompute once (this is the key change)
-    if isinstance(df, pl.DataFrame) and Metrics_Function is Calculate_Metrics_for_Symbol_Polars:
+    if _is_polars_frame(df) and Metrics_Function is Calculate_Metrics_for_Symbol_Polars:
         df = polars_prepare_full(df)
 
     results = {}
@@ -119,7 +131,7 @@ def Rolling_with_Threading(df, Metrics_Function):
     symbols = ["AAPL", "MSFT", "SPY"]
 
     # same idea: precompute once for polars
-    if isinstance(df, pl.DataFrame) and Metrics_Function is Calculate_Metrics_for_Symbol_Polars:
+    if _is_polars_frame(df) and Metrics_Function is Calculate_Metrics_for_Symbol_Polars:
         df = polars_prepare_full(df)
 
     result = {}
@@ -188,6 +200,7 @@ def Profiling(func, *args, **kwargs):
     Returns:
         result, execution_time, memory_MB, avg_cpu, cpu_timeline
     """
+    import psutil
     process = psutil.Process()
     tracemalloc.start()
 
@@ -279,6 +292,8 @@ if __name__ == "__main__":
     mems   = [x[2] for x in records]
     cpus   = [x[3] for x in records]
 
+    import matplotlib.pyplot as plt
+
     fig, axes = plt.subplots(1, 2, figsize=(12, 4))
 
     # --- left: time ---